@@ -1,16 +1,23 @@
 from __future__ import annotations
 
 import os
-from typing import Any
+import re
+from typing import Any, Final
 
-from flask import Flask, Response, jsonify
-from flask_cors import CORS
+import click
+from flask import Flask, Response, jsonify, request
 
 from app.extensions import db
+from app.json_provider import ORJSONProvider
 from app.routes.addresses import bp as addresses_bp
 from app.routes.events import bp as events_bp
 from app.routes.recommendations import bp as recommendations_bp
 
+CORS_ALLOW_METHODS: Final[str] = "GET, POST, DELETE, OPTIONS"
+CORS_MAX_AGE_SECONDS: Final[str] = "86400"
+
+_ENV_LINE: Final[re.Pattern[str]] = re.compile(r"^[ \t]*([^#\s=][^=\n]*?)[ \t]*=(.*)$", re.MULTILINE)
+
 
 def _load_env_file() -> None:
     env_path: str = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".env"))
@@ -18,20 +25,43 @@ def _load_env_file() -> None:
         return
 
     with open(env_path, "r", encoding="utf-8") as env_file:
-        for raw_line in env_file:
-            line: str = raw_line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            key = key.strip()
-            value = value.strip()
-            if key and key not in os.environ:
-                os.environ[key] = value
+        content: str = env_file.read()
+
+    for match in _ENV_LINE.finditer(content):
+        os.environ.setdefault(match.group(1), match.group(2).strip())
+
+
+def _add_cors_headers(response: Response) -> Response:
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    if request.method == "OPTIONS":
+        response.headers["Access-Control-Allow-Methods"] = CORS_ALLOW_METHODS
+        response.headers["Access-Control-Allow-Headers"] = request.headers.get(
+            "Access-Control-Request-Headers", "Content-Type"
+        )
+        response.headers["Access-Control-Max-Age"] = CORS_MAX_AGE_SECONDS
+    return response
+
+
+def _engine_options(database_url: str) -> dict[str, Any]:
+    options: dict[str, Any] = {"query_cache_size": 1200, "pool_pre_ping": True}
+    if database_url.startswith("postgresql+psycopg://"):
+        # psycopg prepares a query after 5 runs on one connection by default; LIFO checkout keeps
+        # a small hot set of connections, so those prepared statements stay warm.
+        options.update(
+            {
+                "pool_size": 20,
+                "max_overflow": 40,
+                "pool_recycle": 1800,
+                "pool_use_lifo": True,
+            }
+        )
+    return options
 
 
 def create_app() -> Flask:
     _load_env_file()
     app: Flask = Flask(__name__)
+    app.json = ORJSONProvider(app)
 
     database_url: str = os.getenv("DATABASE_URL", "sqlite:///whatsmyway.db")
     if database_url.startswith("postgres://"):
@@ -41,12 +71,15 @@ def create_app() -> Flask:
 
     app.config["SQLALCHEMY_DATABASE_URI"] = database_url
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = _engine_options(database_url)
 
-    CORS(app)
+    app.after_request(_add_cors_headers)
     db.init_app(app)
 
-    with app.app_context():
+    @app.cli.command("init-db")
+    def init_db() -> None:
         db.create_all()
+        click.echo("Created database tables.")
 
     @app.get("/api/health")
     def healthcheck() -> Response:
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any
+
+from flask import Response, jsonify, request
+
+
+def conditional_json(payload: Any, cache_control: str) -> Response:
+    response: Response = jsonify(payload)
+    response.headers["Cache-Control"] = cache_control
+    response.set_etag(hashlib.blake2b(response.get_data(), digest_size=16).hexdigest())
+    return response.make_conditional(request)
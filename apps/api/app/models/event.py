@@ -1,33 +1,72 @@
+import os
+import time
 import uuid
 from datetime import datetime
-from typing import Any, cast
+from typing import Any, Final, cast
 
-from sqlalchemy import Float, String
+from sqlalchemy import Column, Float, String
+from sqlalchemy.orm import validates
 
 from app.extensions import db
+from app.services.time_service import to_naive_utc
+
+GEOCODING_PENDING: Final[str] = "pending"
+GEOCODING_DONE: Final[str] = "done"
+GEOCODING_FAILED: Final[str] = "failed"
+
+
+def _uuid7() -> str:
+    # RFC 9562 UUIDv7: 48-bit unix-ms timestamp, then version/variant bits over random data.
+    timestamp_ms: int = time.time_ns() // 1_000_000
+    value: int = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)
+    return str(uuid.UUID(int=value))
 
 
 class SalesEvent(db.Model):
     __tablename__ = "sales_events"
+    __table_args__ = (
+        db.Index(
+            "ix_sales_events_rep_range",
+            "sales_rep_id",
+            "start_at",
+            "end_at",
+            postgresql_include=("id", "title", "address", "lat", "lng", "time_zone", "geocoding_status"),
+        ),
+    )
 
-    id = db.Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(String(36), primary_key=True, default=_uuid7)
     title = db.Column(String(255), nullable=False)
     address = db.Column(String(500), nullable=False)
     start_at = db.Column(db.DateTime(timezone=True), nullable=False)
     end_at = db.Column(db.DateTime(timezone=True), nullable=False)
-    lat = db.Column(Float, nullable=False)
-    lng = db.Column(Float, nullable=False)
-    sales_rep_id = db.Column(String(128), nullable=False, index=True)
+    lat = db.Column(Float, nullable=True)
+    lng = db.Column(Float, nullable=True)
+    sales_rep_id = db.Column(String(128), nullable=False)
     time_zone = db.Column(String(128), nullable=True)
+    geocoding_status = db.Column(String(16), nullable=False, default=GEOCODING_DONE)
+
+    @validates("start_at", "end_at")
+    def _coerce_naive_utc(self, key: str, value: datetime) -> datetime:
+        return to_naive_utc(value)
+
+    @classmethod
+    def dict_columns(cls) -> tuple[Column[Any], ...]:
+        return (
+            cls.__table__.c.id,
+            cls.__table__.c.title,
+            cls.__table__.c.address,
+            cls.__table__.c.start_at,
+            cls.__table__.c.end_at,
+            cls.__table__.c.sales_rep_id,
+            cls.__table__.c.time_zone,
+            cls.__table__.c.geocoding_status,
+        )
 
+    # JSON-safe for stdlib json callers; the orjson routes select dict_columns() directly.
     def to_dict(self) -> dict[str, Any]:
-        payload: dict[str, Any] = {
-            "id": self.id,
-            "title": self.title,
-            "address": self.address,
-            "start_at": cast(datetime, self.start_at).isoformat(),
-            "end_at": cast(datetime, self.end_at).isoformat(),
-            "sales_rep_id": self.sales_rep_id,
-            "time_zone": self.time_zone,
-        }
+        payload: dict[str, Any] = {column.key: getattr(self, column.key) for column in self.dict_columns()}
+        payload["start_at"] = cast(datetime, self.start_at).isoformat()
+        payload["end_at"] = cast(datetime, self.end_at).isoformat()
         return payload
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Final
 
 from flask import Blueprint, Response, jsonify, request
 
+from app.http_cache import conditional_json
 from app.services.location_service import GeocodingError, ProviderConfigurationError, get_location_service
 
 bp = Blueprint("addresses", __name__, url_prefix="/api/addresses")
 
+SUGGESTIONS_CACHE_CONTROL: Final[str] = "public, max-age=60"
+
 
 @bp.get("/suggest")
 def suggest_addresses() -> tuple[Response, int] | Response:
@@ -25,7 +28,7 @@ def suggest_addresses() -> tuple[Response, int] | Response:
     except Exception:
         return jsonify({"error": "Upstream geocoding provider failure"}), 502
 
-    return jsonify({"suggestions": suggestions})
+    return conditional_json({"suggestions": suggestions}, SUGGESTIONS_CACHE_CONTROL)
 
 
 @bp.post("/validate")
@@ -40,8 +43,7 @@ def validate_address() -> tuple[Response, int] | Response:
 
     try:
         location_service = get_location_service()
-        _ = location_service.geocode_address(address)
-        normalized: str = location_service.normalize_address(address)
+        _, normalized = location_service.geocode_and_normalize(address)
     except ValueError as exc:
         return jsonify({"error": str(exc)}), 400
     except GeocodingError as exc:
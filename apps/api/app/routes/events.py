@@ -1,18 +1,41 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
 from datetime import datetime
-from typing import Any
+from typing import Any, Final, cast
 
-from dateutil.parser import ParserError, isoparse
-from flask import Blueprint, Response, jsonify, request
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from sqlalchemy import StatementLambdaElement, insert, lambda_stmt, select
 
 from app.extensions import db
-from app.models.event import SalesEvent
-from app.services.location_service import GeocodingError, ProviderConfigurationError, get_location_service
-from app.services.time_service import to_naive_utc
+from app.http_cache import conditional_json
+from app.json_provider import ORJSONProvider
+from app.models.event import GEOCODING_DONE, GEOCODING_PENDING, SalesEvent
+from app.services.geocoding_jobs import submit_geocoding
+from app.services.location_service import (
+    GeocodingError,
+    GeoPoint,
+    ProviderConfigurationError,
+    get_location_service,
+)
+from app.services.time_service import parse_iso_datetime, to_naive_utc
 
 bp = Blueprint("events", __name__, url_prefix="/api/events")
 
+NDJSON_CHUNK_SIZE: Final[int] = 1000
+# Revalidate every time: a stale list right after create/delete would be wrong, a 304 is still cheap.
+EVENTS_CACHE_CONTROL: Final[str] = "private, no-cache"
+
+
+def _list_events_stmt(sales_rep_id: str, start_at: datetime, end_at: datetime) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(*SalesEvent.dict_columns())
+        .where(SalesEvent.sales_rep_id == sales_rep_id)
+        .where(SalesEvent.end_at >= start_at)
+        .where(SalesEvent.start_at <= end_at)
+        .order_by(SalesEvent.start_at.asc())
+    )
+
 
 @bp.get("")
 def list_events() -> tuple[Response, int] | Response:
@@ -23,18 +46,26 @@ def list_events() -> tuple[Response, int] | Response:
     if not sales_rep_id or not start or not end:
         return jsonify({"error": "sales_rep_id, start and end are required"}), 400
 
-    start_at: datetime = to_naive_utc(isoparse(start))
-    end_at: datetime = to_naive_utc(isoparse(end))
+    start_at: datetime = to_naive_utc(parse_iso_datetime(start))
+    end_at: datetime = to_naive_utc(parse_iso_datetime(end))
 
-    events: list[SalesEvent] = (
-        SalesEvent.query.filter_by(sales_rep_id=sales_rep_id)
-        .filter(SalesEvent.end_at >= start_at)
-        .filter(SalesEvent.start_at <= end_at)
-        .order_by(SalesEvent.start_at.asc())
-        .all()
-    )
+    stmt: StatementLambdaElement = _list_events_stmt(sales_rep_id, start_at, end_at)
+    if request.args.get("format") == "ndjson":
+        return _stream_ndjson(stmt)
+
+    rows = db.session.execute(stmt).mappings()
+    return conditional_json([dict(row) for row in rows], EVENTS_CACHE_CONTROL)
+
+
+def _stream_ndjson(stmt: StatementLambdaElement) -> Response:
+    json_provider: ORJSONProvider = cast(ORJSONProvider, current_app.json)
+
+    def generate() -> Iterator[bytes]:
+        rows = db.session.execute(stmt, execution_options={"yield_per": NDJSON_CHUNK_SIZE}).mappings()
+        for row in rows:
+            yield json_provider.dumps_bytes(dict(row)) + b"\n"
 
-    return jsonify([event.to_dict() for event in events])
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
 
 
 @bp.post("")
@@ -56,9 +87,9 @@ def create_event() -> tuple[Response, int] | Response:
         return jsonify({"error": f"missing fields: {', '.join(missing)}"}), 400
 
     try:
-        start_at: datetime = to_naive_utc(isoparse(str(payload["start_at"])))
-        end_at: datetime = to_naive_utc(isoparse(str(payload["end_at"])))
-    except (TypeError, ValueError, ParserError):
+        start_at: datetime = to_naive_utc(parse_iso_datetime(str(payload["start_at"])))
+        end_at: datetime = to_naive_utc(parse_iso_datetime(str(payload["end_at"])))
+    except ValueError:
         return jsonify({"error": "start_at and end_at must be valid ISO datetime values"}), 400
     if end_at <= start_at:
         return jsonify({"error": "end_at must be after start_at"}), 400
@@ -67,9 +98,15 @@ def create_event() -> tuple[Response, int] | Response:
     if not address:
         return jsonify({"error": "address must be non-empty"}), 400
 
+    title: str = str(payload["title"]).strip()
+    if not title:
+        return jsonify({"error": "title must be non-empty"}), 400
+
+    wait: bool = request.args.get("wait", "true").strip().lower() != "false"
+
     try:
         location_service = get_location_service()
-        point = location_service.geocode_address(address)
+        point: GeoPoint | None = location_service.geocode_address(address) if wait else None
     except ValueError as exc:
         return jsonify({"error": str(exc)}), 400
     except GeocodingError as exc:
@@ -79,29 +116,32 @@ def create_event() -> tuple[Response, int] | Response:
     except Exception:
         return jsonify({"error": "Upstream geocoding provider failure"}), 502
 
-    title: str = str(payload["title"]).strip()
-    if not title:
-        return jsonify({"error": "title must be non-empty"}), 400
-
-    event: SalesEvent = SalesEvent(
-        title=title,
-        address=address,
-        start_at=start_at,
-        end_at=end_at,
-        lat=point.lat,
-        lng=point.lng,
-        sales_rep_id=str(payload["sales_rep_id"]),
-        time_zone=str(payload.get("time_zone")) if payload.get("time_zone") is not None else None,
-    )
-    db.session.add(event)
+    created = db.session.execute(
+        insert(SalesEvent.__table__)
+        .values(
+            title=title,
+            address=address,
+            start_at=start_at,
+            end_at=end_at,
+            lat=point.lat if point is not None else None,
+            lng=point.lng if point is not None else None,
+            sales_rep_id=str(payload["sales_rep_id"]),
+            time_zone=str(payload.get("time_zone")) if payload.get("time_zone") is not None else None,
+            geocoding_status=GEOCODING_DONE if point is not None else GEOCODING_PENDING,
+        )
+        .returning(*SalesEvent.dict_columns())
+    ).mappings().one()
     db.session.commit()
 
-    return jsonify(event.to_dict()), 201
+    if point is None:
+        submit_geocoding(current_app._get_current_object(), location_service, created["id"], address)
+        return jsonify(dict(created)), 202
+    return jsonify(dict(created)), 201
 
 
 @bp.delete("/<event_id>")
 def delete_event(event_id: str) -> tuple[Response, int] | Response:
-    event: SalesEvent | None = SalesEvent.query.filter_by(id=event_id).first()
+    event: SalesEvent | None = db.session.get(SalesEvent, event_id)
     if event is None:
         return jsonify({"error": "event not found"}), 404
 
@@ -3,9 +3,10 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any
 
-from dateutil.parser import ParserError, isoparse
 from flask import Blueprint, Response, jsonify, request
+from sqlalchemy import StatementLambdaElement, lambda_stmt, select
 
+from app.extensions import db
 from app.models.event import SalesEvent
 from app.services.location_service import (
     GeocodingError,
@@ -14,11 +15,21 @@ from app.services.location_service import (
     get_location_service,
 )
 from app.services.recommendation_service import RecommendationResult, recommend_slots
-from app.services.time_service import to_naive_utc
+from app.services.time_service import parse_iso_datetime, to_naive_utc
 
 bp = Blueprint("recommendations", __name__, url_prefix="/api/recommendations")
 
 
+def _events_in_range_stmt(sales_rep_id: str, date_start: datetime, date_end: datetime) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(SalesEvent)
+        .where(SalesEvent.sales_rep_id == sales_rep_id)
+        .where(SalesEvent.start_at >= date_start)
+        .where(SalesEvent.end_at <= date_end)
+        .order_by(SalesEvent.start_at.asc())
+    )
+
+
 @bp.post("")
 def get_recommendations() -> tuple[Response, int] | Response:
     payload_raw: Any = request.get_json(force=True)
@@ -38,9 +49,9 @@ def get_recommendations() -> tuple[Response, int] | Response:
         return jsonify({"error": f"missing fields: {', '.join(missing)}"}), 400
 
     try:
-        date_start: datetime = to_naive_utc(isoparse(str(payload["date_start"])))
-        date_end: datetime = to_naive_utc(isoparse(str(payload["date_end"])))
-    except (TypeError, ValueError, ParserError):
+        date_start: datetime = to_naive_utc(parse_iso_datetime(str(payload["date_start"])))
+        date_end: datetime = to_naive_utc(parse_iso_datetime(str(payload["date_end"])))
+    except ValueError:
         return jsonify({"error": "date_start and date_end must be valid ISO datetime values"}), 400
 
     if date_end <= date_start:
@@ -65,12 +76,8 @@ def get_recommendations() -> tuple[Response, int] | Response:
         return jsonify({"error": "new_event_address must be non-empty"}), 400
 
     sales_rep_id: str = str(payload["sales_rep_id"])
-    events: list[SalesEvent] = (
-        SalesEvent.query.filter_by(sales_rep_id=sales_rep_id)
-        .filter(SalesEvent.start_at >= date_start)
-        .filter(SalesEvent.end_at <= date_end)
-        .order_by(SalesEvent.start_at.asc())
-        .all()
+    events: list[SalesEvent] = list(
+        db.session.execute(_events_in_range_stmt(sales_rep_id, date_start, date_end)).scalars()
     )
 
     try:
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Any, Final, NamedTuple
+
+import orjson
+
+CACHE_FILE_NAME: Final[str] = "geoapify-responses.sqlite3"
+SQLITE_TIMEOUT_SECONDS: Final[float] = 5.0
+# Stale rows stay around for conditional revalidation, but only for so long and only so many of them.
+RESPONSE_MAX_AGE_SECONDS: Final[float] = 7 * 24 * 60 * 60
+RESPONSE_MAX_ENTRIES: Final[int] = 50_000
+PRUNE_EVERY_PUTS: Final[int] = 256
+
+
+class CachedResponse(NamedTuple):
+    payload: dict[str, Any]
+    etag: str | None
+    last_modified: str | None
+    stored_at: float
+
+    def is_fresh(self, ttl_seconds: float) -> bool:
+        return time.time() - self.stored_at < ttl_seconds
+
+
+class GeoResponseCache:
+    def __init__(
+        self,
+        directory: str,
+        max_entries: int = RESPONSE_MAX_ENTRIES,
+        max_age_seconds: float = RESPONSE_MAX_AGE_SECONDS,
+    ):
+        os.makedirs(directory, exist_ok=True)
+        self.path: str = os.path.join(directory, CACHE_FILE_NAME)
+        self.max_entries: int = max_entries
+        self.max_age_seconds: float = max_age_seconds
+        self._puts_since_prune: int = 0
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, payload BLOB NOT NULL, etag TEXT, last_modified TEXT, stored_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)")
+            self._prune(connection)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call keeps the cache safe to share across worker threads.
+        return sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT_SECONDS)
+
+    # The cache is best-effort: a locked or unreadable file falls through to a normal request.
+    def get(self, key: str) -> CachedResponse | None:
+        try:
+            with closing(self._connect()) as connection:
+                row: tuple[bytes, str | None, str | None, float] | None = connection.execute(
+                    "SELECT payload, etag, last_modified, stored_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        return CachedResponse(orjson.loads(row[0]), row[1], row[2], row[3])
+
+    def put(self, key: str, payload: dict[str, Any], etag: str | None, last_modified: str | None) -> None:
+        try:
+            with closing(self._connect()) as connection, connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses (key, payload, etag, last_modified, stored_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, orjson.dumps(payload), etag, last_modified, time.time()),
+                )
+                # Unsynchronised on purpose: a racing thread only shifts when the next sweep runs.
+                self._puts_since_prune += 1
+                if self._puts_since_prune >= PRUNE_EVERY_PUTS:
+                    self._puts_since_prune = 0
+                    self._prune(connection)
+        except sqlite3.Error:
+            pass
+
+    def touch(self, key: str) -> None:
+        try:
+            with closing(self._connect()) as connection, connection:
+                connection.execute("UPDATE responses SET stored_at = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error:
+            pass
+
+    def _prune(self, connection: sqlite3.Connection) -> None:
+        # Oldest first by stored_at, which touch() refreshes, so revalidated entries are kept longest.
+        connection.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - self.max_age_seconds,))
+        connection.execute(
+            "DELETE FROM responses WHERE key IN "
+            "(SELECT key FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
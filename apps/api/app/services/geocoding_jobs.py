@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Final
+
+from flask import Flask
+from sqlalchemy import update
+
+from app.extensions import db
+from app.models.event import GEOCODING_DONE, GEOCODING_FAILED, SalesEvent
+from app.services.location_service import GeoPoint, LocationService
+
+GEOCODING_WORKERS: Final[int] = 4
+
+_executor: ThreadPoolExecutor = ThreadPoolExecutor(
+    max_workers=GEOCODING_WORKERS, thread_name_prefix="geocoding"
+)
+
+
+def geocode_event(app: Flask, location_service: LocationService, event_id: str, address: str) -> None:
+    with app.app_context():
+        values: dict[str, Any]
+        try:
+            point: GeoPoint = location_service.geocode_address(address)
+        except Exception:
+            values = {"geocoding_status": GEOCODING_FAILED}
+        else:
+            values = {"lat": point.lat, "lng": point.lng, "geocoding_status": GEOCODING_DONE}
+
+        table = SalesEvent.__table__
+        db.session.execute(update(table).where(table.c.id == event_id).values(**values))
+        db.session.commit()
+
+
+def submit_geocoding(
+    app: Flask, location_service: LocationService, event_id: str, address: str
+) -> Future[None]:
+    return _executor.submit(geocode_event, app, location_service, event_id, address)
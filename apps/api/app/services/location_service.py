@@ -1,21 +1,51 @@
 from __future__ import annotations
 
-import json
 import math
 import os
-import socket
-import urllib.error
-import urllib.parse
-import urllib.request
-from dataclasses import dataclass
+import time
+import unicodedata
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
-from typing import Any, Final, Protocol
+from typing import Any, Final, NamedTuple, Protocol
+from urllib.parse import urlencode
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.services.geo_cache import GeoResponseCache
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; the NumPy path below covers batches without it.
+    njit = None
 
 AVERAGE_CITY_SPEED_KMH: Final[float] = 35.0
 TRAFFIC_MULTIPLIER: Final[float] = 1.2
 DEFAULT_TIMEOUT_SECONDS: Final[float] = 8.0
 DEFAULT_ROUTE_MODE: Final[str] = "drive"
 DEFAULT_ROUTING_FALLBACK: Final[str] = "off"
+GEOCODE_CACHE_SIZE: Final[int] = 8192
+SUGGESTION_CACHE_SIZE: Final[int] = 8192
+EARTH_RADIUS_KM: Final[float] = 6371.0
+VECTORIZE_MIN_PAIRS: Final[int] = 32
+HAVERSINE_CACHE_SIZE: Final[int] = 4096
+HTTP_POOL_CONNECTIONS: Final[int] = 10
+HTTP_POOL_MAXSIZE: Final[int] = 50
+GEOAPIFY_BATCH_URL: Final[str] = "https://api.geoapify.com/v1/batch"
+GEOAPIFY_ROUTE_MATRIX_URL: Final[str] = "https://api.geoapify.com/v1/routematrix"
+ROUTE_MATRIX_MAX_CELLS: Final[int] = 1000
+ROUTE_MATRIX_MIN_FILL: Final[float] = 0.5
+ROUTE_MATRIX_MIN_STAR_LEGS: Final[int] = 2
+BATCH_MIN_PAIRS: Final[int] = 8
+BATCH_MAX_INPUTS: Final[int] = 1000
+BATCH_POLL_INTERVAL_SECONDS: Final[float] = 1.0
+ROUTING_CONCURRENCY: Final[int] = 8
+SAME_PLACE_DEGREES: Final[float] = 1e-6
+GEOCODE_RESPONSE_TTL_SECONDS: Final[float] = 24 * 60 * 60
+ROUTING_RESPONSE_TTL_SECONDS: Final[float] = 60 * 60
 
 
 class ProviderConfigurationError(RuntimeError):
@@ -30,12 +60,44 @@ class RoutingError(RuntimeError):
     pass
 
 
-@dataclass(frozen=True)
-class GeoPoint:
+class GeoPoint(NamedTuple):
     lat: float
     lng: float
 
 
+def _build_session() -> requests.Session:
+    session: requests.Session = requests.Session()
+    adapter: HTTPAdapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        # Retry refused/reset connects only: read=False re-raises read timeouts as requests.Timeout
+        # instead of repeating a slow upstream call past the request's time budget.
+        max_retries=Retry(total=2, read=False, backoff_factor=0.2),
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+_session: requests.Session = _build_session()
+
+
+def get_session() -> requests.Session:
+    return _session
+
+
+# Caps in-flight routing calls per process to stay within Geoapify's rate limits.
+_routing_executor: ThreadPoolExecutor = ThreadPoolExecutor(
+    max_workers=ROUTING_CONCURRENCY, thread_name_prefix="geoapify-routing"
+)
+
+
+def _is_same_place(origin: GeoPoint, destination: GeoPoint) -> bool:
+    return (
+        abs(origin.lat - destination.lat) < SAME_PLACE_DEGREES
+        and abs(origin.lng - destination.lng) < SAME_PLACE_DEGREES
+    )
+
+
 class GeocodingProvider(Protocol):
     def geocode(self, address: str) -> GeoPoint: ...
     def suggest_addresses(self, query: str, limit: int = 5) -> list[str]: ...
@@ -46,7 +108,13 @@ class RoutingProvider(Protocol):
 
 
 class GeoapifyProvider:
-    def __init__(self, api_key: str, timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS, mode: str = DEFAULT_ROUTE_MODE):
+    def __init__(
+        self,
+        api_key: str,
+        timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+        mode: str = DEFAULT_ROUTE_MODE,
+        response_cache: GeoResponseCache | None = None,
+    ):
         if not api_key:
             raise ProviderConfigurationError(
                 "GEOAPIFY_API_KEY is required when LOCATION_PROVIDER uses geoapify"
@@ -55,23 +123,62 @@ class GeoapifyProvider:
         self.api_key: str = api_key
         self.timeout_seconds: float = timeout_seconds
         self.mode: str = mode
+        self.response_cache: GeoResponseCache | None = response_cache
 
-    def _get_json(self, base_url: str, params: dict[str, str]) -> dict[str, Any]:
-        query: str = urllib.parse.urlencode({**params, "apiKey": self.api_key})
-        request: urllib.request.Request = urllib.request.Request(f"{base_url}?{query}", method="GET")
-
+    def _request_json(
+        self,
+        base_url: str,
+        params: dict[str, str],
+        body: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> tuple[requests.Response, dict[str, Any]]:
+        query: dict[str, str] = {**params, "apiKey": self.api_key}
         try:
-            with urllib.request.urlopen(request, timeout=self.timeout_seconds) as response:
-                payload_raw: str = response.read().decode("utf-8")
-                payload: dict[str, Any] = json.loads(payload_raw)
-                return payload
-        except (TimeoutError, socket.timeout) as exc:
+            session: requests.Session = get_session()
+            response: requests.Response = (
+                session.get(base_url, params=query, headers=headers, timeout=self.timeout_seconds)
+                if body is None
+                else session.post(base_url, params=query, json=body, headers=headers, timeout=self.timeout_seconds)
+            )
+            response.raise_for_status()
+            if response.status_code == 304:
+                return response, {}
+            payload: dict[str, Any] = response.json()
+            return response, payload
+        except requests.Timeout as exc:
             raise RuntimeError("Network read timeout from Geoapify") from exc
-        except urllib.error.HTTPError as exc:
-            body: str = exc.read().decode("utf-8", errors="replace")
-            raise RuntimeError(f"HTTP {exc.code}: {body}") from exc
-        except urllib.error.URLError as exc:
-            raise RuntimeError(f"Network error: {exc.reason}") from exc
+        except requests.HTTPError as exc:
+            raise RuntimeError(f"HTTP {exc.response.status_code}: {exc.response.text}") from exc
+        except requests.RequestException as exc:
+            raise RuntimeError(f"Network error: {exc}") from exc
+
+    def _get_json(
+        self, base_url: str, params: dict[str, str], cache_ttl_seconds: float = GEOCODE_RESPONSE_TTL_SECONDS
+    ) -> dict[str, Any]:
+        if self.response_cache is None:
+            _, payload = self._request_json(base_url, params)
+            return payload
+
+        cache_key: str = f"{base_url}?{urlencode(sorted(params.items()))}"
+        cached = self.response_cache.get(cache_key)
+        if cached is not None and cached.is_fresh(cache_ttl_seconds):
+            return cached.payload
+
+        headers: dict[str, str] = {}
+        if cached is not None and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached is not None and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+        response, payload = self._request_json(base_url, params, headers=headers or None)
+        if response.status_code == 304 and cached is not None:
+            self.response_cache.touch(cache_key)
+            return cached.payload
+
+        self.response_cache.put(
+            cache_key, payload, response.headers.get("ETag"), response.headers.get("Last-Modified")
+        )
+        return payload
 
     def geocode(self, address: str) -> GeoPoint:
         try:
@@ -113,16 +220,24 @@ class GeoapifyProvider:
         return suggestions
 
     def estimate_travel_minutes(self, origin: GeoPoint, destination: GeoPoint) -> float:
+        # Back-to-back meetings at one address: ~0.1 m apart is below routing precision.
+        if _is_same_place(origin, destination):
+            return 2.0
+
         waypoints: str = f"{origin.lat},{origin.lng}|{destination.lat},{destination.lng}"
 
         try:
             payload: dict[str, Any] = self._get_json(
                 "https://api.geoapify.com/v1/routing",
                 {"waypoints": waypoints, "mode": self.mode},
+                cache_ttl_seconds=ROUTING_RESPONSE_TTL_SECONDS,
             )
         except RuntimeError as exc:
             raise RoutingError(f"Failed to estimate route: {exc}") from exc
 
+        return self._route_minutes(payload, origin, destination)
+
+    def _route_minutes(self, payload: dict[str, Any], origin: GeoPoint, destination: GeoPoint) -> float:
         features: list[dict[str, Any]] = payload.get("features", [])
         if not features:
             raise RoutingError(
@@ -137,25 +252,277 @@ class GeoapifyProvider:
 
         return round(max(float(travel_seconds) / 60.0, 2.0), 1)
 
+    def _run_routing_batch(self, pairs: Sequence[tuple[GeoPoint, GeoPoint]]) -> list[dict[str, Any]] | None:
+        body: dict[str, Any] = {
+            "api": "/v1/routing",
+            "params": {"mode": self.mode},
+            "inputs": [
+                {
+                    "id": str(index),
+                    "params": {"waypoints": f"{origin.lat},{origin.lng}|{destination.lat},{destination.lng}"},
+                }
+                for index, (origin, destination) in enumerate(pairs)
+            ],
+        }
+        try:
+            _, job = self._request_json(GEOAPIFY_BATCH_URL, {}, body)
+        except RuntimeError as exc:
+            raise RoutingError(f"Failed to submit routing batch: {exc}") from exc
+
+        job_id: Any = job.get("id")
+        if not job_id:
+            raise RoutingError("Geoapify did not return a batch job id")
+
+        # Polling shares the routing timeout budget; a job still pending after it is left to the caller.
+        max_polls: int = max(1, int(self.timeout_seconds // BATCH_POLL_INTERVAL_SECONDS))
+        for _ in range(max_polls):
+            time.sleep(BATCH_POLL_INTERVAL_SECONDS)
+            try:
+                response, payload = self._request_json(GEOAPIFY_BATCH_URL, {"id": str(job_id)})
+            except RuntimeError as exc:
+                raise RoutingError(f"Failed to fetch routing batch {job_id}: {exc}") from exc
+            # Geoapify answers 202 while the job is still pending.
+            if response.status_code == 200:
+                break
+        else:
+            return None
+
+        results_by_id: dict[str, dict[str, Any]] = {
+            str(result.get("id")): result.get("result") or {} for result in payload.get("results", [])
+        }
+        return [results_by_id.get(str(index), {}) for index in range(len(pairs))]
+
+    def _run_route_matrix(self, pairs: Sequence[tuple[GeoPoint, GeoPoint]]) -> list[float]:
+        source_index: dict[GeoPoint, int] = {}
+        target_index: dict[GeoPoint, int] = {}
+        cells: list[tuple[int, int]] = [
+            (
+                source_index.setdefault(origin, len(source_index)),
+                target_index.setdefault(destination, len(target_index)),
+            )
+            for origin, destination in pairs
+        ]
+        body: dict[str, Any] = {
+            "mode": self.mode,
+            "sources": [{"location": [point.lng, point.lat]} for point in source_index],
+            "targets": [{"location": [point.lng, point.lat]} for point in target_index],
+        }
+        try:
+            _, payload = self._request_json(GEOAPIFY_ROUTE_MATRIX_URL, {}, body)
+        except RuntimeError as exc:
+            raise RoutingError(f"Failed to fetch route matrix: {exc}") from exc
+
+        rows: list[list[dict[str, Any]]] = payload.get("sources_to_targets") or []
+        minutes: list[float] = []
+        for source, target in cells:
+            try:
+                travel_seconds: Any = rows[source][target].get("time")
+            except (IndexError, AttributeError):
+                travel_seconds = None
+            if travel_seconds is None:
+                raise RoutingError(f"No route returned by Geoapify route matrix for mode='{self.mode}'")
+            minutes.append(round(max(float(travel_seconds) / 60.0, 2.0), 1))
+        return minutes
+
+    def estimate_travel_minutes_many(self, pairs: Sequence[tuple[GeoPoint, GeoPoint]]) -> list[float]:
+        minutes: list[float] = [2.0] * len(pairs)
+        routed_indexes: list[int] = [
+            index for index, (origin, destination) in enumerate(pairs) if not _is_same_place(origin, destination)
+        ]
+        routed_pairs: list[tuple[GeoPoint, GeoPoint]] = [pairs[index] for index in routed_indexes]
+        for index, value in zip(routed_indexes, self._route_many(routed_pairs)):
+            minutes[index] = value
+        return minutes
+
+    def _route_many(self, pairs: Sequence[tuple[GeoPoint, GeoPoint]]) -> list[float]:
+        if len(pairs) < BATCH_MIN_PAIRS:
+            return self._route_unshared(pairs)
+
+        # A matrix bills every source x target cell, so the full grid only pays off when the legs fill it.
+        origin_count: int = len({origin for origin, _ in pairs})
+        destination_count: int = len({destination for _, destination in pairs})
+        cell_count: int = origin_count * destination_count
+        if cell_count <= ROUTE_MATRIX_MAX_CELLS and len(pairs) >= cell_count * ROUTE_MATRIX_MIN_FILL:
+            return self._run_route_matrix(pairs)
+
+        # Slot legs fan in and out of the new event, so those go out as one-to-many matrices (one
+        # cell per leg) and only the unshared rest falls through to direct calls or the batch API.
+        stars, rest = _split_route_stars(pairs)
+        minutes: list[float] = [2.0] * len(pairs)
+        star_minutes = _routing_executor.map(
+            lambda star: self._run_route_matrix([pairs[index] for index in star]), stars
+        )
+        for star, values in zip(stars, star_minutes):
+            for index, value in zip(star, values):
+                minutes[index] = value
+        for index, value in zip(rest, self._route_unshared([pairs[index] for index in rest])):
+            minutes[index] = value
+        return minutes
+
+    def _route_unshared(self, pairs: Sequence[tuple[GeoPoint, GeoPoint]]) -> list[float]:
+        # A batch job costs at least one poll interval, so short lists go out as concurrent direct calls.
+        if len(pairs) <= 1:
+            return [self.estimate_travel_minutes(origin, destination) for origin, destination in pairs]
+        if len(pairs) < BATCH_MIN_PAIRS:
+            return list(_routing_executor.map(lambda pair: self.estimate_travel_minutes(*pair), pairs))
+
+        minutes: list[float] = []
+        for offset in range(0, len(pairs), BATCH_MAX_INPUTS):
+            chunk: Sequence[tuple[GeoPoint, GeoPoint]] = pairs[offset : offset + BATCH_MAX_INPUTS]
+            results: list[dict[str, Any]] | None = self._run_routing_batch(chunk)
+            if results is None:
+                minutes.extend(_routing_executor.map(lambda pair: self.estimate_travel_minutes(*pair), chunk))
+                continue
+            minutes.extend(
+                self._route_minutes(result, origin, destination)
+                for result, (origin, destination) in zip(results, chunk)
+            )
+        return minutes
+
+
+def _split_route_stars(pairs: Sequence[tuple[GeoPoint, GeoPoint]]) -> tuple[list[list[int]], list[int]]:
+    # Greedily peels off the endpoint shared by the most remaining legs; each star is a one-to-many
+    # (or many-to-one) matrix. Whatever shares no endpoint is returned as the rest.
+    remaining: list[int] = list(range(len(pairs)))
+    stars: list[list[int]] = []
+    while remaining:
+        by_endpoint: dict[tuple[bool, GeoPoint], list[int]] = {}
+        for index in remaining:
+            origin, destination = pairs[index]
+            by_endpoint.setdefault((True, origin), []).append(index)
+            by_endpoint.setdefault((False, destination), []).append(index)
+        star: list[int] = max(by_endpoint.values(), key=len)[:ROUTE_MATRIX_MAX_CELLS]
+        if len(star) < ROUTE_MATRIX_MIN_STAR_LEGS:
+            break
+        stars.append(star)
+        taken: set[int] = set(star)
+        remaining = [index for index in remaining if index not in taken]
+    return stars, remaining
+
+
+def _haversine_km(origin_lat: float, origin_lng: float, destination_lat: float, destination_lng: float) -> float:
+    lat1: float = math.radians(origin_lat)
+    lat2: float = math.radians(destination_lat)
+    d_lng: float = math.radians(destination_lng - origin_lng)
+    a: float = math.sin((lat2 - lat1) * 0.5) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(d_lng * 0.5) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+
+@lru_cache(maxsize=HAVERSINE_CACHE_SIZE)
+def haversine_travel_minutes(
+    origin_lat: float, origin_lng: float, destination_lat: float, destination_lng: float
+) -> float:
+    distance_km: float = _haversine_km(origin_lat, origin_lng, destination_lat, destination_lng)
+    minutes: float = distance_km / AVERAGE_CITY_SPEED_KMH * 60 * TRAFFIC_MULTIPLIER
+    return round(max(minutes, 2.0), 1)
+
+
+def _unit_ecef(points: np.ndarray) -> np.ndarray:
+    # Unit-sphere x, y, z for (K, 2) lat/lng degrees: the only trig a batch of legs needs.
+    lat, lng = np.radians(points).T
+    cos_lat: np.ndarray = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lng), cos_lat * np.sin(lng), np.sin(lat)))
+
+
+if njit is not None:
+
+    @njit(parallel=True, cache=True)
+    def _chord_minutes_kernel(
+        ecef: np.ndarray, origin_index: np.ndarray, destination_index: np.ndarray, out: np.ndarray
+    ) -> None:
+        for index in prange(origin_index.shape[0]):
+            origin: int = origin_index[index]
+            destination: int = destination_index[index]
+            d_x: float = ecef[origin, 0] - ecef[destination, 0]
+            d_y: float = ecef[origin, 1] - ecef[destination, 1]
+            d_z: float = ecef[origin, 2] - ecef[destination, 2]
+            chord: float = math.sqrt(d_x * d_x + d_y * d_y + d_z * d_z)
+            distance_km: float = 2 * EARTH_RADIUS_KM * math.asin(min(chord * 0.5, 1.0))
+            out[index] = max(distance_km / AVERAGE_CITY_SPEED_KMH * 60 * TRAFFIC_MULTIPLIER, 2.0)
+
+else:
+    _chord_minutes_kernel = None
+
 
 class HaversineRoutingProvider:
-    def _haversine_km(self, origin: GeoPoint, destination: GeoPoint) -> float:
-        radius: float = 6371.0
-        d_lat: float = math.radians(destination.lat - origin.lat)
-        d_lng: float = math.radians(destination.lng - origin.lng)
-        a: float = (
-            math.sin(d_lat / 2) ** 2
-            + math.cos(math.radians(origin.lat))
-            * math.cos(math.radians(destination.lat))
-            * math.sin(d_lng / 2) ** 2
+    def estimate_travel_minutes(self, origin: GeoPoint, destination: GeoPoint) -> float:
+        if _is_same_place(origin, destination):
+            return 2.0
+        return haversine_travel_minutes(origin.lat, origin.lng, destination.lat, destination.lng)
+
+    def estimate_travel_minutes_many(self, pairs: Sequence[tuple[GeoPoint, GeoPoint]]) -> list[float]:
+        # math beats NumPy's per-call overhead on a handful of pairs.
+        if len(pairs) < VECTORIZE_MIN_PAIRS:
+            return [self.estimate_travel_minutes(origin, destination) for origin, destination in pairs]
+
+        # Slot legs fan in and out of a few shared points, the new event's above all, so each
+        # distinct point is converted once and every leg reuses it.
+        point_index: dict[GeoPoint, int] = {}
+        origin_index: list[int] = [point_index.setdefault(origin, len(point_index)) for origin, _ in pairs]
+        destination_index: list[int] = [
+            point_index.setdefault(destination, len(point_index)) for _, destination in pairs
+        ]
+        minutes: np.ndarray = self.estimate_travel_minutes_vector(
+            np.array(list(point_index), dtype=np.float64),
+            np.array(origin_index, dtype=np.intp),
+            np.array(destination_index, dtype=np.intp),
         )
-        c: float = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        return radius * c
+        return [round(value, 1) for value in minutes.tolist()]
 
-    def estimate_travel_minutes(self, origin: GeoPoint, destination: GeoPoint) -> float:
-        distance_km: float = self._haversine_km(origin, destination)
-        minutes: float = distance_km / AVERAGE_CITY_SPEED_KMH * 60 * TRAFFIC_MULTIPLIER
-        return round(max(minutes, 2.0), 1)
+    def estimate_travel_minutes_vector(
+        self, points: np.ndarray, origin_index: np.ndarray, destination_index: np.ndarray
+    ) -> np.ndarray:
+        # The chord c between two unit vectors maps back to the exact great-circle arc as 2*asin(c/2),
+        # so legs match haversine_travel_minutes rather than approximating it.
+        ecef: np.ndarray = _unit_ecef(np.asarray(points, dtype=np.float64))
+        if _chord_minutes_kernel is not None:
+            out: np.ndarray = np.empty(len(origin_index), dtype=np.float64)
+            _chord_minutes_kernel(ecef, origin_index, destination_index, out)
+            return out
+
+        delta: np.ndarray = ecef[origin_index] - ecef[destination_index]
+        chord: np.ndarray = np.sqrt((delta * delta).sum(axis=1))
+        distance_km: np.ndarray = 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(chord * 0.5, 1.0))
+        return np.maximum(distance_km / AVERAGE_CITY_SPEED_KMH * 60 * TRAFFIC_MULTIPLIER, 2.0)
+
+
+def _estimate_many(provider: RoutingProvider, pairs: Sequence[tuple[GeoPoint, GeoPoint]]) -> list[float]:
+    estimate_many = getattr(provider, "estimate_travel_minutes_many", None)
+    if estimate_many is not None:
+        return estimate_many(pairs)
+    return [provider.estimate_travel_minutes(origin, destination) for origin, destination in pairs]
+
+
+def _cache_key(normalized: str) -> str:
+    # NFKC folds composed/decomposed accents and full-width forms onto one cache entry.
+    return unicodedata.normalize("NFKC", normalized).lower()
+
+
+class _CachedLookup:
+    # Hashes and compares on the folded key only, so the provider still receives the caller's spelling.
+    __slots__ = ("text", "key")
+
+    def __init__(self, text: str):
+        self.text: str = text
+        self.key: str = _cache_key(text)
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _CachedLookup) and other.key == self.key
+
+
+# Keyed on the provider rather than the service so cached entries never pin a
+# LocationService and are shared by every service built on the same provider.
+@lru_cache(maxsize=GEOCODE_CACHE_SIZE)
+def _geocode_cached(provider: GeocodingProvider, lookup: _CachedLookup) -> GeoPoint:
+    return provider.geocode(lookup.text)
+
+
+@lru_cache(maxsize=SUGGESTION_CACHE_SIZE)
+def _suggestions_cached(provider: GeocodingProvider, lookup: _CachedLookup, limit: int) -> tuple[str, ...]:
+    return tuple(provider.suggest_addresses(lookup.text, limit=limit))
 
 
 class LocationService:
@@ -176,19 +543,19 @@ class LocationService:
             raise ValueError("address must be a non-empty string")
         return normalized
 
-    @lru_cache(maxsize=2048)
-    def _cached_geocode(self, normalized_address: str) -> GeoPoint:
-        return self.geocoding_provider.geocode(normalized_address)
+    def geocode_and_normalize(self, address: str) -> tuple[GeoPoint, str]:
+        normalized: str = self.normalize_address(address)
+        return _geocode_cached(self.geocoding_provider, _CachedLookup(normalized)), normalized
 
     def geocode_address(self, address: str) -> GeoPoint:
-        normalized: str = self.normalize_address(address)
-        return self._cached_geocode(normalized)
+        point, _ = self.geocode_and_normalize(address)
+        return point
 
     def suggest_addresses(self, query: str, limit: int = 5) -> list[str]:
         normalized_query: str = self.normalize_address(query)
         if len(normalized_query) < 3:
             return []
-        return self.geocoding_provider.suggest_addresses(normalized_query, limit=limit)
+        return list(_suggestions_cached(self.geocoding_provider, _CachedLookup(normalized_query), limit))
 
     def estimate_travel_minutes(self, origin: GeoPoint, destination: GeoPoint) -> float:
         try:
@@ -198,6 +565,21 @@ class LocationService:
                 raise
             return self.fallback_routing_provider.estimate_travel_minutes(origin, destination)
 
+    def estimate_travel_minutes_many(self, pairs: Sequence[tuple[GeoPoint, GeoPoint]]) -> list[float]:
+        if not pairs:
+            return []
+        try:
+            return _estimate_many(self.routing_provider, pairs)
+        except RoutingError:
+            if self.fallback_routing_provider is None:
+                raise
+            return _estimate_many(self.fallback_routing_provider, pairs)
+
+
+def _response_cache_from_env() -> GeoResponseCache | None:
+    cache_dir: str = os.getenv("GEO_CACHE_DIR", "").strip()
+    return GeoResponseCache(cache_dir) if cache_dir else None
+
 
 @lru_cache(maxsize=1)
 def get_location_service() -> LocationService:
@@ -210,6 +592,7 @@ def get_location_service() -> LocationService:
             api_key=os.getenv("GEOAPIFY_API_KEY", "").strip(),
             timeout_seconds=timeout_seconds,
             mode=os.getenv("GEOAPIFY_ROUTE_MODE", DEFAULT_ROUTE_MODE),
+            response_cache=_response_cache_from_env(),
         )
         fallback_provider: RoutingProvider | None = (
             HaversineRoutingProvider() if routing_fallback == "haversine" else None
@@ -229,6 +612,7 @@ def get_location_service() -> LocationService:
             api_key=os.getenv("GEOAPIFY_API_KEY", "").strip(),
             timeout_seconds=timeout_seconds,
             mode=os.getenv("GEOAPIFY_ROUTE_MODE", DEFAULT_ROUTE_MODE),
+            response_cache=_response_cache_from_env(),
         )
         return LocationService(geocoding_provider=geoapify, routing_provider=HaversineRoutingProvider())
 
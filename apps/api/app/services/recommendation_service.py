@@ -1,7 +1,12 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
-from typing import Sequence, TypedDict
+import heapq
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+from typing import NamedTuple, Sequence, TypedDict
 
 from app.models.event import SalesEvent
 from app.services.location_service import GeoPoint, LocationService
@@ -10,6 +15,11 @@ from app.services.time_service import to_naive_utc
 DAY_START_HOUR: int = 8
 DAY_END_HOUR: int = 19
 MAX_SUGGESTIONS: int = 10
+ROUTE_KEY_PRECISION: int = 6
+WINDOW_CACHE_SIZE: int = 64
+
+_RouteKey = tuple[float, float, float, float]
+_SlotLegs = tuple[_RouteKey | None, _RouteKey | None, _RouteKey | None]
 
 
 class RecommendationResult(TypedDict):
@@ -25,58 +35,103 @@ class RecommendationResult(TypedDict):
     explanation: str
 
 
-class CandidateWindow(TypedDict):
+class CandidateWindow(NamedTuple):
     start: datetime
     end: datetime
 
 
-def _build_candidate_windows(
-    date_start: datetime, date_end: datetime, events: Sequence[SalesEvent]
+class _CandidateSlot(TypedDict):
+    start: datetime
+    end: datetime
+    previous_event: SalesEvent | None
+    next_event: SalesEvent | None
+    legs: _SlotLegs
+
+
+def _sorted_event_bounds(
+    events: Sequence[SalesEvent],
+) -> tuple[list[SalesEvent], list[datetime], list[datetime]]:
+    bounds: list[tuple[datetime, datetime, SalesEvent]] = [
+        (to_naive_utc(event.start_at), to_naive_utc(event.end_at), event) for event in events
+    ]
+    bounds.sort(key=itemgetter(0))
+    if not bounds:
+        return [], [], []
+    starts, ends, sorted_events = zip(*bounds)
+    return list(sorted_events), list(starts), list(ends)
+
+
+def _windows_from_bounds(
+    date_start: datetime, date_end: datetime, starts: Sequence[datetime], ends: Sequence[datetime]
 ) -> list[CandidateWindow]:
-    windows: list[CandidateWindow] = []
+    trimmed: list[CandidateWindow] = []
+    append = trimmed.append
     cursor: datetime = to_naive_utc(date_start)
     normalized_end: datetime = to_naive_utc(date_end)
 
-    sorted_events: list[SalesEvent] = sorted(events, key=lambda event: event.start_at)
-
-    for event in sorted_events:
-        event_start: datetime = to_naive_utc(event.start_at)
-        event_end: datetime = to_naive_utc(event.end_at)
+    # Events starting by date_start can only push the cursor forward, so fold them in one step.
+    first_index: int = bisect_right(starts, cursor)
+    if first_index:
+        cursor = max(cursor, max(ends[:first_index]))
+
+    # The cursor only moves forward, so workday bounds are rebuilt once per day rather than per gap.
+    # A trailing (date_end, date_end) sentinel emits the final gap through the same loop body.
+    current_day: date | None = None
+    day_open: datetime = cursor
+    day_close: datetime = cursor
+    for event_start, event_end in zip(
+        chain(starts[first_index:], (normalized_end,)), chain(ends[first_index:], (normalized_end,))
+    ):
         if cursor < event_start:
-            windows.append({"start": cursor, "end": event_start})
+            day: date = cursor.date()
+            if day != current_day:
+                current_day = day
+                day_open = datetime.combine(day, time(DAY_START_HOUR))
+                day_close = datetime.combine(day, time(DAY_END_HOUR))
+            bounded_start: datetime = cursor if cursor > day_open else day_open
+            bounded_end: datetime = event_start if event_start < day_close else day_close
+            if bounded_start < bounded_end:
+                append(CandidateWindow(bounded_start, bounded_end))
         if cursor < event_end:
             cursor = event_end
 
-    if cursor < normalized_end:
-        windows.append({"start": cursor, "end": normalized_end})
+    return trimmed
 
-    trimmed: list[CandidateWindow] = []
-    for window in windows:
-        start: datetime = window["start"]
-        end: datetime = window["end"]
-        day_start: datetime = start.replace(hour=DAY_START_HOUR, minute=0, second=0, microsecond=0)
-        day_end: datetime = start.replace(hour=DAY_END_HOUR, minute=0, second=0, microsecond=0)
-        bounded_start: datetime = max(start, day_start)
-        bounded_end: datetime = min(end, day_end)
-        if bounded_start < bounded_end:
-            trimmed.append({"start": bounded_start, "end": bounded_end})
 
-    return trimmed
+# Keyed on the full bound tuples, so any edit to a rep's schedule misses naturally. Hits come from
+# the same schedule being re-queried back to back, so only the few hot ones are worth pinning. The
+# cached windows are shared between callers and must be treated as read-only.
+@lru_cache(maxsize=WINDOW_CACHE_SIZE)
+def _cached_windows(
+    date_start: datetime, date_end: datetime, starts: tuple[datetime, ...], ends: tuple[datetime, ...]
+) -> tuple[CandidateWindow, ...]:
+    return tuple(_windows_from_bounds(date_start, date_end, starts, ends))
+
+
+def _build_candidate_windows(
+    date_start: datetime, date_end: datetime, events: Sequence[SalesEvent]
+) -> list[CandidateWindow]:
+    _, starts, ends = _sorted_event_bounds(events)
+    return _windows_from_bounds(date_start, date_end, starts, ends)
 
 
 def _neighbors_for_slot(
-    events: Sequence[SalesEvent], slot_start: datetime, slot_end: datetime
+    sorted_events: Sequence[SalesEvent],
+    starts: Sequence[datetime],
+    ends: Sequence[datetime],
+    slot_start: datetime,
+    slot_end: datetime,
 ) -> tuple[SalesEvent | None, SalesEvent | None]:
-    previous_event: SalesEvent | None = None
-    next_event: SalesEvent | None = None
+    next_index: int = bisect_left(starts, slot_end)
+    next_event: SalesEvent | None = sorted_events[next_index] if next_index < len(sorted_events) else None
 
-    for event in events:
-        event_start: datetime = to_naive_utc(event.start_at)
-        event_end: datetime = to_naive_utc(event.end_at)
-        if event_end <= slot_start:
-            previous_event = event
-        if next_event is None and event_start >= slot_end:
-            next_event = event
+    # Ends are not monotonic when events overlap, so walk back from the last event
+    # starting by slot_start to the latest-starting one that is already over.
+    previous_event: SalesEvent | None = None
+    for index in range(bisect_right(starts, slot_start) - 1, -1, -1):
+        if ends[index] <= slot_start:
+            previous_event = sorted_events[index]
+            break
 
     return previous_event, next_event
 
@@ -85,6 +140,15 @@ def _point_from_event(event: SalesEvent) -> GeoPoint:
     return GeoPoint(lat=float(event.lat), lng=float(event.lng))
 
 
+def _route_key(origin: GeoPoint, destination: GeoPoint) -> _RouteKey:
+    return (
+        round(origin.lat, ROUTE_KEY_PRECISION),
+        round(origin.lng, ROUTE_KEY_PRECISION),
+        round(destination.lat, ROUTE_KEY_PRECISION),
+        round(destination.lng, ROUTE_KEY_PRECISION),
+    )
+
+
 def recommend_slots(
     date_start: datetime,
     date_end: datetime,
@@ -98,35 +162,79 @@ def recommend_slots(
     duration: timedelta = timedelta(minutes=duration_minutes)
     buffer: timedelta = timedelta(minutes=buffer_minutes)
     suggestions: list[RecommendationResult] = []
-    windows: list[CandidateWindow] = _build_candidate_windows(date_start, date_end, events)
-
+    sorted_events, starts, ends = _sorted_event_bounds(events)
+    windows: tuple[CandidateWindow, ...] = _cached_windows(date_start, date_end, tuple(starts), tuple(ends))
+    event_points: dict[SalesEvent, GeoPoint] = {
+        event: _point_from_event(event) for event in events if event.lat is not None and event.lng is not None
+    }
+
+    # Pending or failed geocodes still block their time, but legs run to the nearest located neighbours;
+    # otherwise a slot next to one would drop that leg from added_travel_min and rank too well.
+    neighbor_events, neighbor_starts, neighbor_ends = sorted_events, starts, ends
+    if len(event_points) < len(sorted_events):
+        located: list[int] = [index for index, event in enumerate(sorted_events) if event in event_points]
+        neighbor_events = [sorted_events[index] for index in located]
+        neighbor_starts = [starts[index] for index in located]
+        neighbor_ends = [ends[index] for index in located]
+
+    slots: list[_CandidateSlot] = []
+    route_pairs: dict[_RouteKey, tuple[GeoPoint, GeoPoint]] = {}
+    neighbor_legs: dict[tuple[SalesEvent | None, SalesEvent | None], _SlotLegs] = {}
     for window in windows:
-        window_start: datetime = window["start"]
-        window_end: datetime = window["end"]
+        window_start, window_end = window
         candidate_start: datetime = window_start + buffer
         candidate_end: datetime = candidate_start + duration
 
         if candidate_end + buffer > window_end:
             continue
 
-        previous_event, next_event = _neighbors_for_slot(events, candidate_start, candidate_end)
-
-        prev_to_new: float | None = None
-        new_to_next: float | None = None
-        prev_to_next: float = 0.0
+        previous_event, next_event = _neighbors_for_slot(
+            neighbor_events, neighbor_starts, neighbor_ends, candidate_start, candidate_end
+        )
+        # Windows split by the workday trim share neighbours, so their legs are keyed once.
+        legs: _SlotLegs | None = neighbor_legs.get((previous_event, next_event))
+        if legs is None:
+            previous_point: GeoPoint | None = event_points[previous_event] if previous_event is not None else None
+            next_point: GeoPoint | None = event_points[next_event] if next_event is not None else None
+            prev_to_new_key: _RouteKey | None = None
+            new_to_next_key: _RouteKey | None = None
+            prev_to_next_key: _RouteKey | None = None
+
+            if previous_point is not None:
+                prev_to_new_key = _route_key(previous_point, new_event_point)
+                route_pairs.setdefault(prev_to_new_key, (previous_point, new_event_point))
+            if next_point is not None:
+                new_to_next_key = _route_key(new_event_point, next_point)
+                route_pairs.setdefault(new_to_next_key, (new_event_point, next_point))
+            if previous_point is not None and next_point is not None:
+                prev_to_next_key = _route_key(previous_point, next_point)
+                route_pairs.setdefault(prev_to_next_key, (previous_point, next_point))
+
+            legs = (prev_to_new_key, new_to_next_key, prev_to_next_key)
+            neighbor_legs[(previous_event, next_event)] = legs
+
+        slots.append(
+            {
+                "start": candidate_start,
+                "end": candidate_end,
+                "previous_event": previous_event,
+                "next_event": next_event,
+                "legs": legs,
+            }
+        )
 
-        if previous_event is not None:
-            previous_point: GeoPoint = _point_from_event(previous_event)
-            prev_to_new = location_service.estimate_travel_minutes(previous_point, new_event_point)
+    travel_minutes: dict[_RouteKey, float] = dict(
+        zip(route_pairs, location_service.estimate_travel_minutes_many(list(route_pairs.values())))
+    )
 
-        if next_event is not None:
-            next_point: GeoPoint = _point_from_event(next_event)
-            new_to_next = location_service.estimate_travel_minutes(new_event_point, next_point)
+    for slot in slots:
+        previous_event = slot["previous_event"]
+        next_event = slot["next_event"]
+        prev_to_new_key, new_to_next_key, prev_to_next_key = slot["legs"]
 
-        if previous_event is not None and next_event is not None:
-            previous_point = _point_from_event(previous_event)
-            next_point = _point_from_event(next_event)
-            prev_to_next = location_service.estimate_travel_minutes(previous_point, next_point)
+        prev_to_new: float | None = travel_minutes[prev_to_new_key] if prev_to_new_key is not None else None
+        new_to_next: float | None = travel_minutes[new_to_next_key] if new_to_next_key is not None else None
+        prev_to_next: float = travel_minutes[prev_to_next_key] if prev_to_next_key is not None else 0.0
 
         prev_to_new_value: float = prev_to_new if prev_to_new is not None else 0.0
         new_to_next_value: float = new_to_next if new_to_next is not None else 0.0
@@ -142,8 +250,8 @@ def recommend_slots(
 
         suggestions.append(
             {
-                "start_at": candidate_start.isoformat(),
-                "end_at": candidate_end.isoformat(),
+                "start_at": slot["start"].isoformat(),
+                "end_at": slot["end"].isoformat(),
                 "new_event_address": new_event_address,
                 "before_event_id": before_event_id,
                 "after_event_id": after_event_id,
@@ -155,8 +263,8 @@ def recommend_slots(
             }
         )
 
-    ranked: list[RecommendationResult] = sorted(
+    return heapq.nsmallest(
+        MAX_SUGGESTIONS,
         suggestions,
         key=lambda item: (item["added_travel_min"], item["start_at"]),
     )
-    return ranked[:MAX_SUGGESTIONS]
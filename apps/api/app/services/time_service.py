@@ -1,7 +1,17 @@
-from datetime import datetime, timezone
+from datetime import datetime, timezone, tzinfo
+
+_UTC: tzinfo = timezone.utc
 
 
 def to_naive_utc(value: datetime) -> datetime:
-    if value.tzinfo is None:
+    tz: tzinfo | None = value.tzinfo
+    if tz is None:
         return value
-    return value.astimezone(timezone.utc).replace(tzinfo=None)
+    # ISO strings ending in "Z" or "+00:00" parse to the timezone.utc singleton; skip the no-op shift.
+    if tz is _UTC:
+        return value.replace(tzinfo=None)
+    return value.astimezone(_UTC).replace(tzinfo=None)
+
+
+def parse_iso_datetime(value: str) -> datetime:
+    return datetime.fromisoformat(value)
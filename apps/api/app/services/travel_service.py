@@ -1,6 +1,6 @@
 from typing import TypedDict
 
-from app.services.location_service import GeoPoint, HaversineRoutingProvider
+from app.services.location_service import haversine_travel_minutes
 
 
 class Location(TypedDict):
@@ -9,8 +9,4 @@ class Location(TypedDict):
 
 
 def estimate_travel_minutes(origin: Location, destination: Location) -> float:
-    provider = HaversineRoutingProvider()
-    return provider.estimate_travel_minutes(
-        GeoPoint(lat=origin["lat"], lng=origin["lng"]),
-        GeoPoint(lat=destination["lat"], lng=destination["lng"]),
-    )
+    return haversine_travel_minutes(origin["lat"], origin["lng"], destination["lat"], destination["lng"])
@@ -1,8 +1,11 @@
 from flask import Flask
 
 from app import create_app
+from app.extensions import db
 
 app: Flask = create_app()
 
 if __name__ == "__main__":
+    with app.app_context():
+        db.create_all()
     app.run(host="0.0.0.0", port=5001, debug=True)
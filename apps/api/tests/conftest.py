@@ -1,28 +1,118 @@
 from __future__ import annotations
 
 import os
-from collections.abc import Generator
+from collections.abc import Callable, Generator
+from datetime import datetime
+from pathlib import Path
+from typing import Any, NamedTuple
 
+import numpy as np
+import orjson
 import pytest
+from sqlalchemy import RowMapping, insert
 
 from app import create_app
 from app.extensions import db
+from app.models.event import SalesEvent
 
+DATA_DIR = Path(__file__).resolve().parent / "data"
 
-@pytest.fixture()
-def app() -> Generator:
+
+@pytest.fixture(scope="session")
+def _session_app() -> Generator:
+    # Flask-SQLAlchemy serves sqlite :memory: through a StaticPool, so one schema outlives every test.
     os.environ["DATABASE_URL"] = "sqlite:///:memory:"
     flask_app = create_app()
     flask_app.config.update(TESTING=True)
 
+    # One app context spans the session; per-test isolation comes from the app fixture's cleanup.
     with flask_app.app_context():
         db.create_all()
         yield flask_app
-        db.session.remove()
         db.drop_all()
         db.engine.dispose()
 
 
+@pytest.fixture()
+def app(_session_app) -> Generator:
+    yield _session_app
+    db.session.remove()
+    with db.engine.begin() as connection:
+        for table in reversed(db.metadata.sorted_tables):
+            connection.execute(table.delete())
+
+
 @pytest.fixture()
 def client(app):
     return app.test_client()
+
+
+@pytest.fixture()
+def sales_event_factory(app) -> Callable[..., SalesEvent]:
+    # Flushed rather than committed: requests made by the test client share this app context's session.
+    def _create(**overrides: Any) -> SalesEvent:
+        values: dict[str, Any] = {
+            "title": "Visit",
+            "address": "A",
+            "start_at": datetime(2026, 3, 10, 9, 0),
+            "end_at": datetime(2026, 3, 10, 10, 0),
+            "lat": 48.85,
+            "lng": 2.35,
+            "sales_rep_id": "rep",
+            "time_zone": "Europe/Paris",
+            **overrides,
+        }
+        event = SalesEvent(**values)
+        db.session.add(event)
+        db.session.flush()
+        return event
+
+    return _create
+
+
+class ParisAddress(NamedTuple):
+    name: str
+    lat: float
+    lng: float
+
+
+@pytest.fixture(scope="session")
+def paris_addresses() -> tuple[ParisAddress, ...]:
+    raw: list[dict[str, Any]] = orjson.loads((DATA_DIR / "paris_addresses.json").read_bytes())
+    return tuple(ParisAddress(item["name"], float(item["lat"]), float(item["lng"])) for item in raw)
+
+
+@pytest.fixture(scope="session")
+def route_cache() -> dict[str, Any]:
+    return orjson.loads((DATA_DIR / "paris_routes_cache.json").read_bytes())
+
+
+@pytest.fixture()
+def paris_schedule(app, paris_addresses) -> list[RowMapping]:
+    # Back-to-back 20-minute visits every half hour from 08:00.
+    starts: np.ndarray = np.datetime64("2026-03-10T08:00") + np.arange(len(paris_addresses)) * np.timedelta64(30, "m")
+    ends: np.ndarray = starts + np.timedelta64(20, "m")
+    rows: list[dict[str, Any]] = [
+        {
+            "title": f"Visit {location.name}",
+            "address": location.name,
+            "start_at": start_at,
+            "end_at": end_at,
+            "lat": location.lat,
+            "lng": location.lng,
+            "sales_rep_id": "rep-paris",
+            "time_zone": "Europe/Paris",
+        }
+        for location, start_at, end_at in zip(
+            paris_addresses, starts.astype("datetime64[us]").tolist(), ends.astype("datetime64[us]").tolist()
+        )
+    ]
+
+    events: list[RowMapping] = list(
+        db.session.execute(
+            insert(SalesEvent.__table__).returning(*SalesEvent.dict_columns(), sort_by_parameter_order=True),
+            rows,
+        ).mappings()
+    )
+    db.session.commit()
+    return events
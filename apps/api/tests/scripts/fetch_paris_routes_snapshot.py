@@ -1,39 +1,54 @@
 from __future__ import annotations
 
-import json
 from datetime import datetime, timezone
 from pathlib import Path
 from urllib.parse import urlencode
-from urllib.request import urlopen
+
+import numpy as np
+import orjson
+import requests
 
 DATA_DIR = Path(__file__).resolve().parents[1] / "data"
 ADDRESSES_PATH = DATA_DIR / "paris_addresses.json"
 CACHE_PATH = DATA_DIR / "paris_routes_cache.json"
 
 
+def _format_coords(addresses: list[dict]) -> str:
+    # OSRM takes "lng,lat" pairs; the dataset stores 6 decimals, so fixed-point output is lossless.
+    parts: list[str] = []
+    append = parts.append
+    for item in addresses:
+        append(format(item["lng"], ".6f"))
+        append(",")
+        append(format(item["lat"], ".6f"))
+        append(";")
+    return "".join(parts[:-1])
+
+
 def main() -> None:
-    addresses = json.loads(ADDRESSES_PATH.read_text())
-    coords = ";".join(f"{item['lng']},{item['lat']}" for item in addresses)
+    addresses = orjson.loads(ADDRESSES_PATH.read_bytes())
+    coords = _format_coords(addresses)
     query = urlencode({"annotations": "duration"})
     url = f"https://router.project-osrm.org/table/v1/driving/{coords}?{query}"
 
-    with urlopen(url, timeout=60) as response:
-        payload = json.loads(response.read().decode("utf-8"))
+    # A keep-alive session lets follow-up matrix requests reuse the OSRM connection.
+    with requests.Session() as session:
+        response = session.get(url, timeout=60)
+        response.raise_for_status()
+        payload = orjson.loads(response.content)
 
-    durations_sec = payload["durations"]
-    durations_min = [
-        [round((value or 0.0) / 60, 2) for value in row]
-        for row in durations_sec
-    ]
+    # OSRM reports unroutable pairs as null, which float64 turns into NaN.
+    durations_sec = np.nan_to_num(np.asarray(payload["durations"], dtype=np.float64), nan=0.0)
+    durations_min = np.round(durations_sec / 60.0, 2).tolist()
 
     snapshot = {
         "provider": "osrm",
         "profile": "driving",
-        "captured_at": datetime.now(timezone.utc).isoformat(),
+        "captured_at": datetime.now(timezone.utc),
         "source": url,
         "durations_min": durations_min,
     }
-    CACHE_PATH.write_text(json.dumps(snapshot, indent=2) + "\n")
+    CACHE_PATH.write_bytes(orjson.dumps(snapshot, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
     print(f"Saved routing snapshot for {len(addresses)} Paris addresses to {CACHE_PATH}")
 
 
@@ -7,10 +7,10 @@ class _FakeLocationService:
     def suggest_addresses(self, query: str, limit: int = 5) -> list[str]:
         return [f"{query} A", f"{query} B"][:limit]
 
-    def geocode_address(self, address: str):
+    def geocode_and_normalize(self, address: str):
         if address == "bad":
             raise GeocodingError("bad address")
-        return object()
+        return object(), self.normalize_address(address)
 
     def normalize_address(self, address: str) -> str:
         return " ".join(address.strip().split())
@@ -27,6 +27,15 @@ def test_suggest_addresses_success(client, monkeypatch):
     response = client.get("/api/addresses/suggest", query_string={"q": "Paris"})
     assert response.status_code == 200
     assert response.get_json()["suggestions"] == ["Paris A", "Paris B"]
+    assert response.headers["Cache-Control"] == "public, max-age=60"
+
+    revalidated = client.get(
+        "/api/addresses/suggest",
+        query_string={"q": "Paris"},
+        headers={"If-None-Match": response.headers["ETag"]},
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.data == b""
 
 
 def test_suggest_addresses_provider_errors(client, monkeypatch):
@@ -1,10 +1,31 @@
 from __future__ import annotations
 
+from sqlalchemy import inspect
+
+from app import _engine_options
+from app.extensions import db
+
 
 def test_healthcheck(client):
     response = client.get("/api/health")
     assert response.status_code == 200
     assert response.get_json() == {"status": "ok"}
+    assert response.headers["Access-Control-Allow-Origin"] == "*"
+
+
+def test_cors_preflight(client):
+    response = client.options(
+        "/api/events",
+        headers={
+            "Origin": "http://localhost:5173",
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "content-type",
+        },
+    )
+    assert response.status_code == 200
+    assert response.headers["Access-Control-Allow-Origin"] == "*"
+    assert "POST" in response.headers["Access-Control-Allow-Methods"]
+    assert response.headers["Access-Control-Allow-Headers"] == "content-type"
 
 
 def test_recommendations_rejects_invalid_range(client):
@@ -18,3 +39,28 @@ def test_recommendations_rejects_invalid_range(client):
     response = client.post("/api/recommendations", json=payload)
     assert response.status_code == 400
     assert response.get_json()["error"] == "date_end must be after date_start"
+
+
+def test_malformed_json_body_is_rejected(client):
+    response = client.post("/api/recommendations", data=b"{not json", content_type="application/json")
+    assert response.status_code == 400
+
+
+def test_init_db_command_creates_tables(app):
+    db.drop_all()
+    assert not inspect(db.engine).has_table("sales_events")
+
+    result = app.test_cli_runner().invoke(args=["init-db"])
+
+    assert result.exit_code == 0
+    assert inspect(db.engine).has_table("sales_events")
+
+
+def test_engine_options_only_tune_pool_for_postgres():
+    postgres = _engine_options("postgresql+psycopg://user@host/db")
+    assert postgres["pool_use_lifo"] is True
+    assert "connect_args" not in postgres
+
+    sqlite = _engine_options("sqlite:///:memory:")
+    assert "pool_size" not in sqlite
+    assert "connect_args" not in sqlite
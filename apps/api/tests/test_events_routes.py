@@ -1,5 +1,19 @@
 from __future__ import annotations
 
+import json
+import threading
+from concurrent.futures import Future
+
+from app.services.geocoding_jobs import geocode_event, submit_geocoding
+from app.services.location_service import GeocodingError, GeoPoint
+
+
+class _FakeLocationService:
+    def geocode_address(self, address: str) -> GeoPoint:
+        if address == "bad":
+            raise GeocodingError("bad address")
+        return GeoPoint(lat=48.8556, lng=2.3572)
+
 
 def test_create_event_and_list_events(client):
     payload = {
@@ -55,3 +69,95 @@ def test_list_events_requires_query_params(client):
     response = client.get("/api/events")
     assert response.status_code == 400
     assert "sales_rep_id, start and end are required" in response.get_json()["error"]
+
+
+def test_create_event_without_wait_geocodes_in_background(client, monkeypatch):
+    monkeypatch.setattr("app.routes.events.get_location_service", lambda: _FakeLocationService())
+    monkeypatch.setattr("app.routes.events.submit_geocoding", geocode_event)
+    payload = {
+        "title": "Client Visit",
+        "start_at": "2026-03-01T09:00:00Z",
+        "end_at": "2026-03-01T10:00:00Z",
+        "sales_rep_id": "rep-paris",
+    }
+
+    accepted = client.post("/api/events?wait=false", json={**payload, "address": "10 Rue de Rivoli"})
+    failed = client.post("/api/events?wait=false", json={**payload, "address": "bad"})
+    assert accepted.status_code == 202
+    accepted_event = accepted.get_json()
+    assert accepted_event["geocoding_status"] == "pending"
+
+    listed = client.get(
+        "/api/events",
+        query_string={"sales_rep_id": "rep-paris", "start": "2026-03-01T00:00:00Z", "end": "2026-03-01T23:59:59Z"},
+    ).get_json()
+    statuses = {event["id"]: event["geocoding_status"] for event in listed}
+    assert statuses == {accepted_event["id"]: "done", failed.get_json()["id"]: "failed"}
+
+
+def test_create_event_without_wait_geocodes_on_worker_thread(client, monkeypatch):
+    threads: list[str] = []
+    futures: list[Future[None]] = []
+
+    class _ThreadRecordingLocationService(_FakeLocationService):
+        def geocode_address(self, address: str) -> GeoPoint:
+            threads.append(threading.current_thread().name)
+            return super().geocode_address(address)
+
+    def _submit_and_keep(*args) -> Future[None]:
+        future = submit_geocoding(*args)
+        futures.append(future)
+        return future
+
+    monkeypatch.setattr("app.routes.events.get_location_service", lambda: _ThreadRecordingLocationService())
+    monkeypatch.setattr("app.routes.events.submit_geocoding", _submit_and_keep)
+
+    accepted = client.post(
+        "/api/events?wait=false",
+        json={
+            "title": "Client Visit",
+            "address": "10 Rue de Rivoli",
+            "start_at": "2026-03-01T09:00:00Z",
+            "end_at": "2026-03-01T10:00:00Z",
+            "sales_rep_id": "rep-paris",
+        },
+    )
+    assert accepted.status_code == 202
+    futures[0].result(timeout=5)
+
+    listed = client.get(
+        "/api/events",
+        query_string={"sales_rep_id": "rep-paris", "start": "2026-03-01T00:00:00Z", "end": "2026-03-01T23:59:59Z"},
+    ).get_json()
+    assert [event["geocoding_status"] for event in listed] == ["done"]
+    assert threads and threads[0].startswith("geocoding")
+
+
+def test_list_events_streams_ndjson(client, monkeypatch):
+    monkeypatch.setattr("app.routes.events.get_location_service", lambda: _FakeLocationService())
+    for hour in (9, 11):
+        created = client.post(
+            "/api/events",
+            json={
+                "title": f"Visit {hour}",
+                "address": "10 Rue de Rivoli",
+                "start_at": f"2026-03-01T{hour:02d}:00:00Z",
+                "end_at": f"2026-03-01T{hour:02d}:30:00Z",
+                "sales_rep_id": "rep-paris",
+            },
+        )
+        assert created.status_code == 201
+
+    response = client.get(
+        "/api/events",
+        query_string={
+            "sales_rep_id": "rep-paris",
+            "start": "2026-03-01T00:00:00Z",
+            "end": "2026-03-01T23:59:59Z",
+            "format": "ndjson",
+        },
+    )
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.data.splitlines()]
+    assert [line["title"] for line in lines] == ["Visit 9", "Visit 11"]
@@ -1,10 +1,21 @@
 from __future__ import annotations
 
+import contextlib
 import os
+import socket
+import threading
+import time
+import weakref
+from collections.abc import Callable
+from typing import NamedTuple
 
+import numpy as np
 import pytest
+import requests
 
+from app.services.geo_cache import GeoResponseCache
 from app.services.location_service import (
+    GEOCODE_RESPONSE_TTL_SECONDS,
     GeocodingError,
     GeoapifyProvider,
     GeoPoint,
@@ -12,10 +23,65 @@ from app.services.location_service import (
     LocationService,
     ProviderConfigurationError,
     RoutingError,
+    _build_session,
+    _unit_ecef,
     get_location_service,
+    haversine_travel_minutes,
 )
 
 
+class _FakeCall(NamedTuple):
+    method: str
+    url: str
+    params: dict
+    body: dict | None
+    headers: dict | None
+
+
+class _FakeResponse:
+    def __init__(self, status_code: int = 200, payload: dict | None = None, headers: dict | None = None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = "boom"
+        self._payload = payload or {}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(response=self)
+
+    def json(self) -> dict:
+        return self._payload
+
+
+class _FakeSession:
+    def __init__(self, respond: Callable[[_FakeCall], _FakeResponse | Exception]):
+        self.respond = respond
+        self.calls: list[_FakeCall] = []
+
+    def get(self, url: str, params: dict, timeout: float, headers: dict | None = None):
+        return self._send(_FakeCall("GET", url, params, None, headers))
+
+    def post(self, url: str, params: dict, json: dict, timeout: float, headers: dict | None = None):
+        return self._send(_FakeCall("POST", url, params, json, headers))
+
+    def _send(self, call: _FakeCall) -> _FakeResponse:
+        self.calls.append(call)
+        outcome = self.respond(call)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def fake_session(monkeypatch):
+    def _install(respond: Callable[[_FakeCall], _FakeResponse | Exception]) -> _FakeSession:
+        session = _FakeSession(respond)
+        monkeypatch.setattr("app.services.location_service.get_session", lambda: session)
+        return session
+
+    return _install
+
+
 def test_geoapify_provider_parsing_and_errors(monkeypatch):
     provider = GeoapifyProvider(api_key="x")
 
@@ -61,33 +127,369 @@ def test_location_service_normalize_and_fallback():
         service.normalize_address("   ")
 
 
-def test_get_location_service_env_branches(monkeypatch):
+@pytest.fixture
+def clear_location_service_cache():
+    get_location_service.cache_clear()
+    yield
     get_location_service.cache_clear()
-    monkeypatch.setenv("LOCATION_PROVIDER", "geoapify")
+
+
+@pytest.mark.parametrize(
+    "env, expected",
+    [
+        ({"LOCATION_PROVIDER": "geoapify", "ROUTING_FALLBACK": "off"}, "no_fallback"),
+        ({"LOCATION_PROVIDER": "geoapify", "ROUTING_FALLBACK": "haversine"}, "haversine_fallback"),
+        ({"LOCATION_PROVIDER": "geoapify", "ROUTING_FALLBACK": "invalid"}, ProviderConfigurationError),
+        ({"LOCATION_PROVIDER": "unknown", "ROUTING_FALLBACK": "invalid"}, ProviderConfigurationError),
+        ({"LOCATION_PROVIDER": "geoapify-haversine", "ROUTING_FALLBACK": "invalid"}, "haversine_routing"),
+    ],
+)
+def test_get_location_service_env_branches(monkeypatch, clear_location_service_cache, env, expected):
     monkeypatch.setenv("GEOAPIFY_API_KEY", "key")
-    monkeypatch.setenv("ROUTING_FALLBACK", "off")
+    monkeypatch.delenv("GEO_CACHE_DIR", raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+
+    if expected is ProviderConfigurationError:
+        with pytest.raises(ProviderConfigurationError):
+            get_location_service()
+        return
+
     service = get_location_service()
-    assert service.fallback_routing_provider is None
+    if expected == "no_fallback":
+        assert service.fallback_routing_provider is None
+    elif expected == "haversine_fallback":
+        assert isinstance(service.fallback_routing_provider, HaversineRoutingProvider)
+    else:
+        assert isinstance(service.routing_provider, HaversineRoutingProvider)
 
-    get_location_service.cache_clear()
-    monkeypatch.setenv("ROUTING_FALLBACK", "haversine")
-    service_fb = get_location_service()
-    assert service_fb.fallback_routing_provider is not None
 
-    get_location_service.cache_clear()
-    monkeypatch.setenv("ROUTING_FALLBACK", "invalid")
-    with pytest.raises(ProviderConfigurationError):
-        get_location_service()
+def test_location_service_caches_geocode_and_suggestions_by_normalized_key():
+    calls: list[str] = []
 
-    get_location_service.cache_clear()
-    monkeypatch.setenv("LOCATION_PROVIDER", "unknown")
-    with pytest.raises(ProviderConfigurationError):
-        get_location_service()
+    class _Geo:
+        def geocode(self, address: str) -> GeoPoint:
+            calls.append(address)
+            return GeoPoint(1.0, 2.0)
 
-    get_location_service.cache_clear()
-    monkeypatch.setenv("LOCATION_PROVIDER", "geoapify-haversine")
-    monkeypatch.setenv("GEOAPIFY_API_KEY", "key")
-    service_h = get_location_service()
-    assert isinstance(service_h.routing_provider, HaversineRoutingProvider)
+        def suggest_addresses(self, query: str, limit: int = 5) -> list[str]:
+            calls.append(query)
+            return [f"{query} A"][:limit]
 
-    get_location_service.cache_clear()
+    geo = _Geo()
+    service = LocationService(geo, HaversineRoutingProvider())
+    assert service.geocode_address("11 Rue Lalo") == service.geocode_address("  11  rue LALO ")
+    assert service.suggest_addresses("Paris") == service.suggest_addresses("paris ")
+    assert calls == ["11 Rue Lalo", "Paris"]
+    assert service.geocode_address("Place de l'E\u0301glise") == service.geocode_address("Place de l'\u00c9glise")
+    assert calls == ["11 Rue Lalo", "Paris", "Place de l'E\u0301glise"]
+
+    service_ref = weakref.ref(service)
+    del service
+    assert service_ref() is None
+    assert LocationService(geo, HaversineRoutingProvider()).geocode_address("11 rue lalo") == GeoPoint(1.0, 2.0)
+    assert calls == ["11 Rue Lalo", "Paris", "Place de l'E\u0301glise"]
+
+
+def test_estimate_travel_minutes_many_vectorizes_and_falls_back():
+    haversine = HaversineRoutingProvider()
+    pairs = [
+        (GeoPoint(48.85 + i * 0.001, 2.35), GeoPoint(48.86, 2.36 - i * 0.002))
+        for i in range(40)
+    ]
+    assert haversine.estimate_travel_minutes_many(pairs) == [
+        haversine.estimate_travel_minutes(origin, destination) for origin, destination in pairs
+    ]
+    vector = haversine.estimate_travel_minutes_vector(
+        np.array([(48.85, 2.35), (48.90, 2.40)]), np.array([0, 0]), np.array([0, 1])
+    )
+    assert vector.shape == (2,)
+    assert vector[0] == 2.0
+    assert round(float(vector[1]), 1) == haversine.estimate_travel_minutes(GeoPoint(48.85, 2.35), GeoPoint(48.90, 2.40))
+
+    class _BrokenRouting:
+        def estimate_travel_minutes(self, _o: GeoPoint, _d: GeoPoint) -> float:
+            raise RoutingError("no route")
+
+    service = LocationService(object(), _BrokenRouting(), haversine)
+    assert service.estimate_travel_minutes_many(pairs[:3]) == haversine.estimate_travel_minutes_many(pairs[:3])
+    assert service.estimate_travel_minutes_many([]) == []
+
+
+@pytest.mark.parametrize("backend", ["numba", "numpy"])
+def test_haversine_vector_backends_match_scalar_path(monkeypatch, backend):
+    if backend == "numba":
+        pytest.importorskip("numba")
+    else:
+        monkeypatch.setattr("app.services.location_service._chord_minutes_kernel", None)
+
+    rng = np.random.default_rng(7)
+    origins = [GeoPoint(lat, lng) for lat, lng in zip(rng.uniform(48.7, 49.0, 500), rng.uniform(2.1, 2.6, 500))]
+    destinations = [GeoPoint(lat, lng) for lat, lng in zip(rng.uniform(48.7, 49.0, 500), rng.uniform(2.1, 2.6, 500))]
+    new_event = GeoPoint(48.85837, 2.294481)
+    pairs = (
+        list(zip(origins, destinations))
+        + [(origin, new_event) for origin in origins[:50]]
+        + [(new_event, destination) for destination in destinations[:50]]
+        + [(origin, origin) for origin in origins[:10]]
+    )
+
+    assert HaversineRoutingProvider().estimate_travel_minutes_many(pairs) == [
+        haversine_travel_minutes(origin.lat, origin.lng, destination.lat, destination.lng)
+        for origin, destination in pairs
+    ]
+
+
+def test_haversine_batch_converts_each_distinct_point_once(monkeypatch):
+    converted: list[int] = []
+
+    def _spy(points: np.ndarray) -> np.ndarray:
+        converted.append(len(points))
+        return _unit_ecef(points)
+
+    monkeypatch.setattr("app.services.location_service._unit_ecef", _spy)
+    new_event = GeoPoint(48.85837, 2.294481)
+    events = [GeoPoint(48.85 + index / 1000, 2.35 - index / 1000) for index in range(40)]
+    pairs = [(event, new_event) for event in events] + [(new_event, event) for event in events]
+
+    minutes = HaversineRoutingProvider().estimate_travel_minutes_many(pairs)
+
+    assert converted == [len(events) + 1]
+    assert minutes == [
+        haversine_travel_minutes(origin.lat, origin.lng, destination.lat, destination.lng)
+        for origin, destination in pairs
+    ]
+
+
+def test_geoapify_get_json_uses_shared_session_and_translates_errors(fake_session):
+    provider = GeoapifyProvider(api_key="secret")
+    session = fake_session(lambda _call: _FakeResponse(200, {"ok": True}))
+    assert provider._get_json("https://example.test", {"text": "A"}) == {"ok": True}
+    assert [(call.url, call.params) for call in session.calls] == [
+        ("https://example.test", {"text": "A", "apiKey": "secret"})
+    ]
+
+    for outcome, message in [
+        (_FakeResponse(401), "HTTP 401: boom"),
+        (requests.Timeout(), "Network read timeout"),
+        (requests.ConnectionError("refused"), "Network error: refused"),
+    ]:
+        fake_session(lambda _call, outcome=outcome: outcome)
+        with pytest.raises(RuntimeError, match=message):
+            provider._get_json("https://example.test", {})
+
+
+def test_geoapify_read_timeout_is_not_retried(monkeypatch):
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(8)
+    accepted: list[socket.socket] = []
+
+    def _accept_and_stay_silent() -> None:
+        with contextlib.suppress(OSError):
+            while True:
+                accepted.append(server.accept()[0])
+
+    threading.Thread(target=_accept_and_stay_silent, daemon=True).start()
+    session = _build_session()
+    session.mount("http://", session.get_adapter("https://"))
+    monkeypatch.setattr("app.services.location_service.get_session", lambda: session)
+    provider = GeoapifyProvider(api_key="secret", timeout_seconds=0.2)
+
+    try:
+        with pytest.raises(RuntimeError, match="Network read timeout from Geoapify"):
+            provider._get_json(f"http://127.0.0.1:{server.getsockname()[1]}/geocode", {})
+        assert len(accepted) == 1
+    finally:
+        server.close()
+        for connection in accepted:
+            connection.close()
+
+
+def test_geoapify_batch_routing_submits_once_and_polls_until_finished(monkeypatch, fake_session):
+    def _respond(call: _FakeCall) -> _FakeResponse:
+        if call.method == "POST":
+            return _FakeResponse(202, {"id": "job-1", "status": "pending"})
+        assert call.params["id"] == "job-1"
+        if sum(seen.method == "GET" for seen in session.calls) == 1:
+            return _FakeResponse(202, {"id": "job-1", "status": "pending"})
+        inputs = session.calls[0].body["inputs"]
+        return _FakeResponse(
+            200,
+            {
+                "id": "job-1",
+                "status": "finished",
+                "results": [
+                    {"id": item["id"], "result": {"features": [{"properties": {"time": 60 * (int(item["id"]) + 1)}}]}}
+                    for item in reversed(inputs)
+                ],
+            },
+        )
+
+    session = fake_session(_respond)
+    monkeypatch.setattr("app.services.location_service.time.sleep", lambda _seconds: None)
+    monkeypatch.setattr("app.services.location_service.ROUTE_MATRIX_MAX_CELLS", 0)
+    provider = GeoapifyProvider(api_key="secret")
+    pairs = [(GeoPoint(48.85, 2.35), GeoPoint(48.86 + index / 100, 2.36)) for index in range(10)]
+
+    minutes = provider.estimate_travel_minutes_many(pairs)
+
+    assert minutes == [2.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0]
+    posted = [call.body for call in session.calls if call.method == "POST"]
+    assert len(posted) == 1
+    assert posted[0]["api"] == "/v1/routing"
+    assert posted[0]["inputs"][0]["params"]["waypoints"] == "48.85,2.35|48.86,2.36"
+    assert sum(call.method == "GET" for call in session.calls) == 2
+
+    provider._request_json("https://example.test", {}, {"inputs": []}, headers={"If-None-Match": '"v1"'})
+    assert [call.headers for call in session.calls if call.method == "POST"] == [None, {"If-None-Match": '"v1"'}]
+
+
+def test_geoapify_pending_batch_falls_back_to_direct_calls_within_timeout(monkeypatch):
+    polls: list[str] = []
+    provider = GeoapifyProvider(api_key="secret", timeout_seconds=2.0)
+
+    def _fake_request_json(url: str, params: dict, body: dict | None = None, headers: dict | None = None):
+        if body is None:
+            polls.append(params["id"])
+        return _FakeResponse(202), {"id": "job-1", "status": "pending"}
+
+    def _fake_get_json(_url: str, params: dict[str, str], **_kwargs) -> dict:
+        return {"features": [{"properties": {"time": 300}}]}
+
+    monkeypatch.setattr(provider, "_request_json", _fake_request_json)
+    monkeypatch.setattr(provider, "_get_json", _fake_get_json)
+    monkeypatch.setattr("app.services.location_service.time.sleep", lambda _seconds: None)
+    monkeypatch.setattr("app.services.location_service.ROUTE_MATRIX_MAX_CELLS", 0)
+    pairs = [(GeoPoint(48.85, 2.35), GeoPoint(48.86 + index / 100, 2.36)) for index in range(10)]
+
+    assert provider.estimate_travel_minutes_many(pairs) == [5.0] * 10
+    assert polls == ["job-1", "job-1"]
+
+
+def _fake_route_matrix(posted: list[dict]):
+    # Cell (source, target) answers 10 * source + target + 1 minutes.
+    def _fake_request_json(url: str, params: dict, body: dict | None = None, headers: dict | None = None):
+        assert url.endswith("/v1/routematrix")
+        posted.append(body)
+        rows = [
+            [{"time": 60 * (10 * source + target + 1)} for target in range(len(body["targets"]))]
+            for source in range(len(body["sources"]))
+        ]
+        return None, {"sources_to_targets": rows}
+
+    return _fake_request_json
+
+
+def test_geoapify_dense_leg_grid_uses_one_route_matrix(monkeypatch):
+    posted: list[dict] = []
+    provider = GeoapifyProvider(api_key="secret")
+    monkeypatch.setattr(provider, "_request_json", _fake_route_matrix(posted))
+    offices = [GeoPoint(48.85, 2.35 + index / 100) for index in range(3)]
+    clients = [GeoPoint(48.86 + index / 100, 2.36) for index in range(3)]
+    pairs = [(office, client) for office in offices for client in clients]
+
+    minutes = provider.estimate_travel_minutes_many(pairs)
+
+    assert len(posted) == 1
+    assert posted[0]["mode"] == "drive"
+    assert len(posted[0]["sources"]) == 3 and len(posted[0]["targets"]) == 3
+    assert posted[0]["sources"][0] == {"location": [2.35, 48.85]}
+    assert minutes == [2.0, 2.0, 3.0, 11.0, 12.0, 13.0, 21.0, 22.0, 23.0]
+
+
+def test_geoapify_sparse_legs_use_one_to_many_matrices_per_shared_endpoint(monkeypatch):
+    posted: list[dict] = []
+    direct: list[tuple[GeoPoint, GeoPoint]] = []
+
+    def _fake_direct(origin: GeoPoint, destination: GeoPoint) -> float:
+        direct.append((origin, destination))
+        return 7.0
+
+    provider = GeoapifyProvider(api_key="secret")
+    monkeypatch.setattr(provider, "_request_json", _fake_route_matrix(posted))
+    monkeypatch.setattr(provider, "estimate_travel_minutes", _fake_direct)
+    office = GeoPoint(48.85, 2.35)
+    clients = [GeoPoint(48.86 + index / 100, 2.36) for index in range(5)]
+    chain = list(zip(clients, clients[1:]))
+    pairs = [(client, office) for client in clients] + [(office, client) for client in clients] + chain
+
+    minutes = provider.estimate_travel_minutes_many(pairs)
+
+    shapes = sorted((len(body["sources"]), len(body["targets"])) for body in posted)
+    assert shapes == [(1, 5), (5, 1)]
+    assert sum(rows * columns for rows, columns in shapes) + len(direct) == len(pairs)
+    assert sorted(direct) == sorted(chain)
+    assert minutes == [2.0, 11.0, 21.0, 31.0, 41.0, 2.0, 2.0, 3.0, 4.0, 5.0, 7.0, 7.0, 7.0, 7.0]
+
+
+def test_geoapify_short_route_lists_run_concurrently(monkeypatch):
+    barrier = threading.Barrier(3, timeout=2)
+    provider = GeoapifyProvider(api_key="secret")
+
+    def _fake_get_json(_url: str, params: dict[str, str], **_kwargs) -> dict:
+        barrier.wait()
+        seconds = 60 * len(params["waypoints"])
+        return {"features": [{"properties": {"time": seconds}}]}
+
+    monkeypatch.setattr(provider, "_get_json", _fake_get_json)
+    pairs = [(GeoPoint(48.85, 2.35), GeoPoint(48.86, 2.3 + index)) for index in range(3)]
+
+    assert provider.estimate_travel_minutes_many(pairs) == [
+        float(len(f"48.85,2.35|48.86,{2.3 + index}")) for index in range(3)
+    ]
+
+
+def test_geoapify_skips_routing_for_same_place_legs(monkeypatch):
+    provider = GeoapifyProvider(api_key="secret")
+    requested: list[str] = []
+
+    def _fake_get_json(_url: str, params: dict[str, str], **_kwargs) -> dict:
+        requested.append(params["waypoints"])
+        return {"features": [{"properties": {"time": 600}}]}
+
+    monkeypatch.setattr(provider, "_get_json", _fake_get_json)
+    office = GeoPoint(48.8606, 2.3376)
+
+    assert provider.estimate_travel_minutes(office, GeoPoint(48.8606 + 5e-7, 2.3376)) == 2.0
+    assert provider.estimate_travel_minutes_many(
+        [(office, office), (office, GeoPoint(48.87, 2.33)), (GeoPoint(48.87, 2.33), GeoPoint(48.87, 2.33))]
+    ) == [2.0, 10.0, 2.0]
+    assert requested == ["48.8606,2.3376|48.87,2.33"]
+
+
+def test_geoapify_disk_cache_serves_fresh_hits_and_revalidates_stale_ones(monkeypatch, tmp_path, fake_session):
+    def _respond(call: _FakeCall) -> _FakeResponse:
+        if call.headers and call.headers.get("If-None-Match") == '"v1"':
+            return _FakeResponse(304)
+        feature = {"properties": {"lat": 48.85, "lon": 2.35}}
+        return _FakeResponse(200, {"features": [feature]}, {"ETag": '"v1"', "Last-Modified": "Tue, 10 Mar 2026"})
+
+    session = fake_session(_respond)
+    provider = GeoapifyProvider(api_key="secret", response_cache=GeoResponseCache(str(tmp_path)))
+
+    assert provider.geocode("11 rue lalo") == GeoPoint(48.85, 2.35)
+    assert provider.geocode("11 rue lalo") == GeoPoint(48.85, 2.35)
+    assert [call.headers for call in session.calls] == [None]
+
+    expired = time.time() + GEOCODE_RESPONSE_TTL_SECONDS + 1
+    monkeypatch.setattr("app.services.geo_cache.time.time", lambda: expired)
+    restarted = GeoapifyProvider(api_key="secret", response_cache=GeoResponseCache(str(tmp_path)))
+    assert restarted.geocode("11 rue lalo") == GeoPoint(48.85, 2.35)
+    assert session.calls[1].headers == {"If-None-Match": '"v1"', "If-Modified-Since": "Tue, 10 Mar 2026"}
+
+
+def test_geo_response_cache_drops_expired_rows_and_caps_its_size(monkeypatch, tmp_path):
+    now = [1000.0]
+    monkeypatch.setattr("app.services.geo_cache.time.time", lambda: now[0])
+    monkeypatch.setattr("app.services.geo_cache.PRUNE_EVERY_PUTS", 1)
+    cache = GeoResponseCache(str(tmp_path), max_entries=3, max_age_seconds=60.0)
+
+    for index in range(5):
+        now[0] = 1000.0 + index
+        cache.put(f"k{index}", {"index": index}, None, None)
+    assert [cache.get(f"k{index}") is not None for index in range(5)] == [False, False, True, True, True]
+
+    now[0] = 1063.5
+    GeoResponseCache(str(tmp_path), max_entries=3, max_age_seconds=60.0)
+    assert [cache.get(f"k{index}") is not None for index in range(5)] == [False, False, False, False, True]
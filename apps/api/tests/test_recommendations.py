@@ -1,99 +1,116 @@
 from __future__ import annotations
 
-import json
-from datetime import datetime
-from pathlib import Path
+import functools
+from datetime import datetime, timedelta
+from typing import NamedTuple
 
+import numpy as np
 import pytest
 
-from app.extensions import db
 from app.models.event import SalesEvent
-from app.services.location_service import GeoPoint, LocationService
+from app.services.location_service import (
+    AVERAGE_CITY_SPEED_KMH,
+    EARTH_RADIUS_KM,
+    TRAFFIC_MULTIPLIER,
+    GeoPoint,
+    HaversineRoutingProvider,
+    LocationService,
+)
 from app.services.recommendation_service import recommend_slots
-from app.services.travel_service import estimate_travel_minutes
 
-DATA_DIR = Path(__file__).resolve().parent / "data"
-ADDRESSES = json.loads((DATA_DIR / "paris_addresses.json").read_text())
-ROUTE_CACHE = json.loads((DATA_DIR / "paris_routes_cache.json").read_text())
+COORD_OFFSET = 1_000_000_000
 
 
-def _coord_key(lat: float, lng: float) -> tuple[float, float]:
-    return (round(lat, 6), round(lng, 6))
+@functools.lru_cache(maxsize=64)
+def _coord_key(lat: float, lng: float) -> int:
+    # Offset micro-degrees are positive and below 2**32, so both fit side by side in one int.
+    return ((round(lat * 1_000_000) + COORD_OFFSET) << 32) | (round(lng * 1_000_000) + COORD_OFFSET)
 
 
-def _load_real_route_lookup() -> dict[tuple[tuple[float, float], tuple[float, float]], float]:
-    durations = ROUTE_CACHE.get("durations_min")
-    if not durations:
-        pytest.skip(
-            "Missing real routing snapshot. Run tests/scripts/fetch_paris_routes_snapshot.py once "
-            "to fetch and store the 20-address Paris route matrix."
-        )
-
-    coords = [_coord_key(item["lat"], item["lng"]) for item in ADDRESSES]
-    lookup: dict[tuple[tuple[float, float], tuple[float, float]], float] = {}
-    for i, row in enumerate(durations):
-        for j, minutes in enumerate(row):
-            lookup[(coords[i], coords[j])] = float(minutes)
-    return lookup
-
-
-def _create_paris_schedule() -> list[SalesEvent]:
-    events: list[SalesEvent] = []
-    base_hour = 8
-    for index, location in enumerate(ADDRESSES):
-        start_hour = base_hour + index // 2
-        start_minute = 0 if index % 2 == 0 else 30
-        start_at = datetime(2026, 3, 10, start_hour, start_minute)
-        end_at = datetime(2026, 3, 10, start_hour, start_minute + 20)
-        event = SalesEvent(
-            title=f"Visit {location['name']}",
-            address=location["name"],
-            start_at=start_at,
-            end_at=end_at,
-            lat=location["lat"],
-            lng=location["lng"],
-            sales_rep_id="rep-paris",
-            time_zone="Europe/Paris",
-        )
-        db.session.add(event)
-        events.append(event)
+class _ParisIndex(NamedTuple):
+    address_index: dict[str, int]
+    points: tuple[GeoPoint, ...]
+    coord_index: dict[int, int]
+    lat: np.ndarray
+    lng: np.ndarray
 
-    db.session.commit()
-    return events
 
+@pytest.fixture(scope="session")
+def paris_index(paris_addresses) -> _ParisIndex:
+    return _ParisIndex(
+        address_index={item.name: index for index, item in enumerate(paris_addresses)},
+        points=tuple(GeoPoint(lat=item.lat, lng=item.lng) for item in paris_addresses),
+        coord_index={_coord_key(item.lat, item.lng): index for index, item in enumerate(paris_addresses)},
+        lat=np.radians(np.array([item.lat for item in paris_addresses], dtype=np.float64)),
+        lng=np.radians(np.array([item.lng for item in paris_addresses], dtype=np.float64)),
+    )
 
-def test_get_recommendations_extensive_paris_dataset_with_cached_real_routes(app, client, monkeypatch):
-    route_lookup = _load_real_route_lookup()
-    address_to_point = {
-        item["name"]: GeoPoint(lat=float(item["lat"]), lng=float(item["lng"])) for item in ADDRESSES
-    }
 
-    class FakeLocationService:
-        def geocode_address(self, address: str) -> GeoPoint:
-            point = address_to_point.get(address)
-            if point is None:
-                raise ValueError(f"Unknown test address: {address}")
-            return point
+@pytest.fixture(scope="session")
+def haversine_matrix(paris_index) -> np.ndarray:
+    lat, lng = paris_index.lat, paris_index.lng
+    d_lat = lat[:, None] - lat[None, :]
+    d_lng = lng[:, None] - lng[None, :]
+    a = np.sin(d_lat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(d_lng / 2) ** 2
+    distance_km = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+    matrix = np.maximum(distance_km / AVERAGE_CITY_SPEED_KMH * 60 * TRAFFIC_MULTIPLIER, 2.0)
+    matrix.setflags(write=False)
+    return matrix
 
-        def estimate_travel_minutes(self, origin: GeoPoint, destination: GeoPoint) -> float:
-            key = (_coord_key(origin.lat, origin.lng), _coord_key(destination.lat, destination.lng))
-            value = route_lookup.get(key)
-            if value is None:
-                raise KeyError(f"Missing cached route for {key}")
-            return value
 
-    monkeypatch.setattr("app.routes.recommendations.get_location_service", lambda: FakeLocationService())
+@pytest.fixture(scope="session")
+def real_route_matrix(route_cache) -> np.ndarray:
+    durations = route_cache.get("durations_min")
+    if not durations:
+        pytest.skip(
+            "Missing real routing snapshot. Run tests/scripts/fetch_paris_routes_snapshot.py once "
+            "to fetch and store the 20-address Paris route matrix."
+        )
+    return np.asarray(durations, dtype=np.float32)
+
+
+class _MatrixLocationService:
+    def __init__(self, matrix: np.ndarray, paris_index: _ParisIndex):
+        self.matrix = matrix
+        self.paris_index = paris_index
+
+    def geocode_address(self, address: str) -> GeoPoint:
+        index = self.paris_index.address_index.get(address)
+        if index is None:
+            raise ValueError(f"Unknown test address: {address}")
+        return self.paris_index.points[index]
+
+    def estimate_travel_minutes(self, origin: GeoPoint, destination: GeoPoint) -> float:
+        origin_index = self.paris_index.coord_index.get(_coord_key(origin.lat, origin.lng))
+        destination_index = self.paris_index.coord_index.get(_coord_key(destination.lat, destination.lng))
+        if origin_index is None or destination_index is None:
+            raise KeyError(f"Missing cached route for {origin} -> {destination}")
+        return float(self.matrix[origin_index, destination_index])
+
+    def estimate_travel_minutes_many(self, pairs: list[tuple[GeoPoint, GeoPoint]]) -> list[float]:
+        return [self.estimate_travel_minutes(origin, destination) for origin, destination in pairs]
+
+
+@pytest.mark.parametrize(
+    "travel_matrix_fixture", ["haversine_matrix", "real_route_matrix"], ids=["haversine", "cached_real"]
+)
+def test_get_recommendations_extensive_paris_dataset(
+    request, client, monkeypatch, paris_addresses, paris_index, paris_schedule, travel_matrix_fixture
+):
+    route_matrix = request.getfixturevalue(travel_matrix_fixture)
+    monkeypatch.setattr(
+        "app.routes.recommendations.get_location_service",
+        lambda: _MatrixLocationService(route_matrix, paris_index),
+    )
 
-    with app.app_context():
-        events = _create_paris_schedule()
-        event_ids = {event.id for event in events}
+    event_ids = {event["id"] for event in paris_schedule}
 
     payload = {
         "date_start": "2026-03-10T08:00:00+01:00",
         "date_end": "2026-03-10T19:00:00+01:00",
         "sales_rep_id": "rep-paris",
         "new_event_duration_min": 10,
-        "new_event_address": ADDRESSES[0]["name"],
+        "new_event_address": paris_addresses[0].name,
         "buffer_min": 0,
     }
 
@@ -104,10 +121,12 @@ def test_get_recommendations_extensive_paris_dataset_with_cached_real_routes(app
     assert 1 <= len(suggestions) <= 10
     assert suggestions == sorted(suggestions, key=lambda item: (item["added_travel_min"], item["start_at"]))
 
+    expected_duration = timedelta(minutes=payload["new_event_duration_min"])
     for suggestion in suggestions:
-        start = datetime.fromisoformat(suggestion["start_at"])
-        end = datetime.fromisoformat(suggestion["end_at"])
-        assert (end - start).total_seconds() == 10 * 60
+        assert (
+            datetime.fromisoformat(suggestion["end_at"]) - datetime.fromisoformat(suggestion["start_at"])
+            == expected_duration
+        )
         assert suggestion["total_travel_min"] >= suggestion["added_travel_min"]
         assert "Inserted between" in suggestion["explanation"]
 
@@ -122,68 +141,163 @@ def test_get_recommendations_extensive_paris_dataset_with_cached_real_routes(app
     assert linked_ids.issubset(event_ids)
 
 
+def test_haversine_minutes_matrix_matches_routing_provider(haversine_matrix, paris_index):
+    provider = HaversineRoutingProvider()
+    points = paris_index.points
+
+    assert haversine_matrix.shape == (len(points), len(points))
+    for i, origin in enumerate(points):
+        for j, destination in enumerate(points):
+            assert haversine_matrix[i, j] == pytest.approx(
+                provider.estimate_travel_minutes(origin, destination), abs=0.05
+            )
+
+
 def test_recommendations_requires_fields(client):
     response = client.post("/api/recommendations", json={"sales_rep_id": "rep-paris"})
     assert response.status_code == 400
     assert "missing fields" in response.get_json()["error"]
 
 
+@functools.lru_cache(maxsize=None)
+def _dist(origin: GeoPoint, destination: GeoPoint) -> float:
+    return HaversineRoutingProvider().estimate_travel_minutes(origin, destination)
+
+
 def test_recommend_slots_computes_added_travel_delta(app):
-    with app.app_context():
-        previous_event = SalesEvent(
-            title="Morning",
-            address="A",
-            start_at=datetime(2026, 3, 11, 9, 0),
-            end_at=datetime(2026, 3, 11, 9, 30),
-            lat=48.8606,
-            lng=2.3376,
-            sales_rep_id="rep-x",
-        )
-        next_event = SalesEvent(
-            title="Noon",
-            address="B",
-            start_at=datetime(2026, 3, 11, 11, 0),
-            end_at=datetime(2026, 3, 11, 11, 30),
-            lat=48.8738,
-            lng=2.2950,
-            sales_rep_id="rep-x",
-        )
+    previous_event = SalesEvent(
+        title="Morning",
+        address="A",
+        start_at=datetime(2026, 3, 11, 9, 0),
+        end_at=datetime(2026, 3, 11, 9, 30),
+        lat=48.8606,
+        lng=2.3376,
+        sales_rep_id="rep-x",
+    )
+    next_event = SalesEvent(
+        title="Noon",
+        address="B",
+        start_at=datetime(2026, 3, 11, 11, 0),
+        end_at=datetime(2026, 3, 11, 11, 30),
+        lat=48.8738,
+        lng=2.2950,
+        sales_rep_id="rep-x",
+    )
 
-        class FakeLocationService:
-            def estimate_travel_minutes(self, origin: GeoPoint, destination: GeoPoint) -> float:
-                return estimate_travel_minutes(
-                    {"lat": origin.lat, "lng": origin.lng},
-                    {"lat": destination.lat, "lng": destination.lng},
-                )
-
-        suggestions = recommend_slots(
-            date_start=datetime(2026, 3, 11, 8, 0),
-            date_end=datetime(2026, 3, 11, 19, 0),
-            events=[previous_event, next_event],
-            new_event_point=GeoPoint(lat=48.85837, lng=2.294481),
-            new_event_address="Midpoint",
-            duration_minutes=30,
-            buffer_minutes=10,
-            location_service=FakeLocationService(),
-        )
+    class FakeLocationService:
+        def estimate_travel_minutes(self, origin: GeoPoint, destination: GeoPoint) -> float:
+            return _dist(origin, destination)
+
+        def estimate_travel_minutes_many(self, pairs: list[tuple[GeoPoint, GeoPoint]]) -> list[float]:
+            return [_dist(origin, destination) for origin, destination in pairs]
+
+    suggestions = recommend_slots(
+        date_start=datetime(2026, 3, 11, 8, 0),
+        date_end=datetime(2026, 3, 11, 19, 0),
+        events=[previous_event, next_event],
+        new_event_point=GeoPoint(lat=48.85837, lng=2.294481),
+        new_event_address="Midpoint",
+        duration_minutes=30,
+        buffer_minutes=10,
+        location_service=FakeLocationService(),
+    )
 
     assert suggestions
     best = suggestions[0]
 
-    prev_to_new = estimate_travel_minutes(
-        {"lat": previous_event.lat, "lng": previous_event.lng},
-        {"lat": 48.85837, "lng": 2.294481},
-    )
-    new_to_next = estimate_travel_minutes(
-        {"lat": 48.85837, "lng": 2.294481},
-        {"lat": next_event.lat, "lng": next_event.lng},
-    )
-    prev_to_next = estimate_travel_minutes(
-        {"lat": previous_event.lat, "lng": previous_event.lng},
-        {"lat": next_event.lat, "lng": next_event.lng},
-    )
+    previous_point = GeoPoint(previous_event.lat, previous_event.lng)
+    new_point = GeoPoint(48.85837, 2.294481)
+    next_point = GeoPoint(next_event.lat, next_event.lng)
+    prev_to_new = _dist(previous_point, new_point)
+    new_to_next = _dist(new_point, next_point)
+    prev_to_next = _dist(previous_point, next_point)
 
     expected_added = round(max(prev_to_new + new_to_next - prev_to_next, 0.0), 1)
     assert best["added_travel_min"] == expected_added
     assert best["before_event_id"] == previous_event.id
     assert best["after_event_id"] == next_event.id
+
+
+def test_recommend_slots_requests_each_rounded_route_once(app):
+    office = (48.8606, 2.3376)
+    events = [
+        SalesEvent(
+            title=f"Visit {index}",
+            address="Office",
+            start_at=datetime(2026, 3, 11, hour, 0),
+            end_at=datetime(2026, 3, 11, hour, 30),
+            lat=office[0] + jitter,
+            lng=office[1],
+            sales_rep_id="rep-x",
+        )
+        for index, (hour, jitter) in enumerate([(9, 0.0), (11, 4e-8), (14, 0.0)])
+    ]
+
+    class CountingLocationService:
+        def __init__(self):
+            self.batches: list[list[tuple[GeoPoint, GeoPoint]]] = []
+
+        def estimate_travel_minutes_many(self, pairs: list[tuple[GeoPoint, GeoPoint]]) -> list[float]:
+            self.batches.append(list(pairs))
+            return [5.0 for _ in pairs]
+
+    location_service = CountingLocationService()
+    suggestions = recommend_slots(
+        date_start=datetime(2026, 3, 11, 8, 0),
+        date_end=datetime(2026, 3, 11, 19, 0),
+        events=events,
+        new_event_point=GeoPoint(lat=48.85837, lng=2.294481),
+        new_event_address="Tower",
+        duration_minutes=30,
+        buffer_minutes=10,
+        location_service=location_service,
+    )
+
+    assert len(suggestions) == 4
+    assert len(location_service.batches) == 1
+    assert len(location_service.batches[0]) == 3
+
+
+def test_recommend_slots_measures_legs_from_located_neighbors_around_pending_events(app):
+    morning, pending, noon = (
+        SalesEvent(
+            id=title.lower(),
+            title=title,
+            address=title,
+            start_at=datetime(2026, 3, 11, hour, 0),
+            end_at=datetime(2026, 3, 11, hour, 30),
+            lat=lat,
+            lng=lng,
+            sales_rep_id="rep-x",
+            geocoding_status=status,
+        )
+        for title, hour, lat, lng, status in [
+            ("Morning", 9, 48.8606, 2.3376, "done"),
+            ("Pending", 11, None, None, "pending"),
+            ("Noon", 13, 48.8738, 2.2950, "done"),
+        ]
+    )
+
+    class FakeLocationService:
+        def estimate_travel_minutes_many(self, pairs: list[tuple[GeoPoint, GeoPoint]]) -> list[float]:
+            return [_dist(origin, destination) for origin, destination in pairs]
+
+    suggestions = recommend_slots(
+        date_start=datetime(2026, 3, 11, 8, 0),
+        date_end=datetime(2026, 3, 11, 19, 0),
+        events=[noon, pending, morning],
+        new_event_point=GeoPoint(lat=48.85837, lng=2.294481),
+        new_event_address="Tower",
+        duration_minutes=30,
+        buffer_minutes=10,
+        location_service=FakeLocationService(),
+    )
+
+    assert suggestions
+    assert pending.id not in {item["before_event_id"] for item in suggestions} | {
+        item["after_event_id"] for item in suggestions
+    }
+    after_pending = next(item for item in suggestions if item["start_at"] == "2026-03-11T11:40:00")
+    assert (after_pending["before_event_id"], after_pending["after_event_id"]) == (morning.id, noon.id)
+    assert after_pending["travel_from_previous_min"] is not None
+    assert after_pending["travel_to_next_min"] is not None
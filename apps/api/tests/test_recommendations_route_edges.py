@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from datetime import datetime
+from collections.abc import Callable
 
-from app.extensions import db
-from app.models.event import SalesEvent
+import orjson
+import pytest
+
+import app.routes.recommendations as recommendations_routes
 from app.services.location_service import GeocodingError, ProviderConfigurationError, RoutingError
 
 
@@ -27,75 +29,58 @@ class _RouteLocationService:
             raise self.route_error
         return 7.0
 
-
-def test_recommendations_invalid_types_and_values(client):
-    payload = {
-        "date_start": "2026-03-10T08:00:00Z",
-        "date_end": "2026-03-10T19:00:00Z",
-        "sales_rep_id": "rep",
-        "new_event_duration_min": "x",
-        "new_event_address": "A",
-    }
-    r = client.post("/api/recommendations", json=payload)
-    assert r.status_code == 400
-    assert "must be an integer" in r.get_json()["error"]
-
-    payload["new_event_duration_min"] = 10
-    payload["buffer_min"] = -1
-    r2 = client.post("/api/recommendations", json=payload)
-    assert r2.status_code == 400
-    assert "zero or positive" in r2.get_json()["error"]
-
-
-def test_recommendations_provider_failures(client, monkeypatch):
-    base = {
-        "date_start": "2026-03-10T08:00:00Z",
-        "date_end": "2026-03-10T19:00:00Z",
-        "sales_rep_id": "rep",
-        "new_event_duration_min": 10,
-        "new_event_address": "A",
-    }
-
-    monkeypatch.setattr(
-        "app.routes.recommendations.get_location_service",
-        lambda: _RouteLocationService(geocode_error=GeocodingError("geo bad")),
-    )
-    r_geo = client.post("/api/recommendations", json=base)
-    assert r_geo.status_code == 502
-
-    monkeypatch.setattr(
-        "app.routes.recommendations.get_location_service",
-        lambda: _RouteLocationService(geocode_error=ProviderConfigurationError("missing key")),
-    )
-    r_conf = client.post("/api/recommendations", json=base)
-    assert r_conf.status_code == 503
-
-
-def test_recommendations_success_with_route_error_handling(app, client, monkeypatch):
-    with app.app_context():
-        db.session.add(
-            SalesEvent(
-                title="Morning",
-                address="A",
-                start_at=datetime(2026, 3, 10, 9, 0),
-                end_at=datetime(2026, 3, 10, 10, 0),
-                lat=48.85,
-                lng=2.35,
-                sales_rep_id="rep",
-                time_zone="Europe/Paris",
-            )
-        )
-        db.session.commit()
-
-    monkeypatch.setattr("app.routes.recommendations.get_location_service", lambda: _RouteLocationService())
-
-    payload = {
-        "date_start": "2026-03-10T08:00:00Z",
-        "date_end": "2026-03-10T19:00:00Z",
-        "sales_rep_id": "rep",
-        "new_event_duration_min": 30,
-        "new_event_address": "Test",
-    }
-    ok = client.post("/api/recommendations", json=payload)
-    assert ok.status_code == 200
-    assert "suggestions" in ok.get_json()
+    def estimate_travel_minutes_many(self, pairs):
+        return [self.estimate_travel_minutes(origin, destination) for origin, destination in pairs]
+
+
+@pytest.fixture()
+def location_service(monkeypatch) -> Callable[..., _RouteLocationService]:
+    def _install(**errors: Exception) -> _RouteLocationService:
+        service = _RouteLocationService(**errors)
+        monkeypatch.setattr(recommendations_routes, "get_location_service", lambda: service)
+        return service
+
+    return _install
+
+
+_BASE_PAYLOAD: dict[str, object] = {
+    "date_start": "2026-03-10T08:00:00Z",
+    "date_end": "2026-03-10T19:00:00Z",
+    "sales_rep_id": "rep",
+    "new_event_duration_min": 30,
+    "new_event_address": "A",
+}
+
+
+@pytest.mark.parametrize(
+    "body, errors, status, message",
+    [
+        (orjson.dumps({**_BASE_PAYLOAD, "new_event_duration_min": "x"}), None, 400, "must be an integer"),
+        (orjson.dumps({**_BASE_PAYLOAD, "buffer_min": -1}), None, 400, "zero or positive"),
+        (orjson.dumps(_BASE_PAYLOAD), {"geocode_error": GeocodingError("geo bad")}, 502, "geo bad"),
+        (orjson.dumps(_BASE_PAYLOAD), {"geocode_error": ProviderConfigurationError("missing key")}, 503, "missing key"),
+        (orjson.dumps(_BASE_PAYLOAD), {"route_error": RoutingError("no route")}, 502, "no route"),
+        (orjson.dumps(_BASE_PAYLOAD), {}, 200, None),
+    ],
+    ids=[
+        "non_integer_duration",
+        "negative_buffer",
+        "geocoding_error",
+        "provider_misconfigured",
+        "routing_error",
+        "success",
+    ],
+)
+def test_recommendations_route_edges(client, location_service, sales_event_factory, body, errors, status, message):
+    morning = sales_event_factory(title="Morning")
+    if errors is not None:
+        location_service(**errors)
+
+    response = client.post("/api/recommendations", data=body, content_type="application/json")
+
+    assert response.status_code == status
+    result = response.get_json()
+    if message is not None:
+        assert message in result["error"]
+    else:
+        assert any(suggestion["before_event_id"] == morning.id for suggestion in result["suggestions"])
@@ -1,13 +1,25 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
 
-from app.services.recommendation_service import _build_candidate_windows
+from app.models.event import SalesEvent, _uuid7
+from app.services.recommendation_service import (
+    CandidateWindow,
+    _build_candidate_windows,
+    _cached_windows,
+    _neighbors_for_slot,
+    _sorted_event_bounds,
+)
 from app.services.time_service import to_naive_utc
 from app.services.travel_service import estimate_travel_minutes
 
 
 class StubEvent:
+    __slots__ = ("start_at", "end_at")
+
     def __init__(self, start_at: datetime, end_at: datetime):
         self.start_at = start_at
         self.end_at = end_at
@@ -20,6 +32,21 @@ def test_to_naive_utc_keeps_naive_and_converts_aware():
     assert to_naive_utc(naive) == naive
     assert to_naive_utc(aware).tzinfo is None
     assert to_naive_utc(aware) == datetime(2026, 3, 10, 12, 0)
+    assert to_naive_utc(datetime(2026, 3, 10, 12, 0, tzinfo=timezone(timedelta(hours=1)))) == datetime(
+        2026, 3, 10, 11, 0
+    )
+
+
+def test_sales_event_stores_naive_utc_datetimes():
+    event = SalesEvent(
+        start_at=datetime(2026, 3, 10, 12, 0, tzinfo=timezone.utc),
+        end_at=datetime(2026, 3, 10, 13, 0),
+    )
+
+    assert event.start_at == datetime(2026, 3, 10, 12, 0)
+    assert event.start_at.tzinfo is None
+    assert event.end_at == datetime(2026, 3, 10, 13, 0)
+    assert json.loads(json.dumps(event.to_dict()))["start_at"] == "2026-03-10T12:00:00"
 
 
 def test_estimate_travel_minutes_has_floor_and_distance_growth():
@@ -40,6 +67,59 @@ def test_build_candidate_windows_respects_workday_hours():
     windows = _build_candidate_windows(datetime(2026, 3, 10, 6, 0), datetime(2026, 3, 10, 22, 0), events)
 
     assert windows == [
-        {"start": datetime(2026, 3, 10, 8, 30), "end": datetime(2026, 3, 10, 10, 0)},
-        {"start": datetime(2026, 3, 10, 11, 0), "end": datetime(2026, 3, 10, 18, 30)},
+        CandidateWindow(datetime(2026, 3, 10, 8, 30), datetime(2026, 3, 10, 10, 0)),
+        CandidateWindow(datetime(2026, 3, 10, 11, 0), datetime(2026, 3, 10, 18, 30)),
+    ]
+
+
+def test_build_candidate_windows_skips_events_started_before_range():
+    events = [
+        StubEvent(datetime(2026, 3, 10, 8, 0), datetime(2026, 3, 10, 12, 0)),
+        StubEvent(datetime(2026, 3, 10, 9, 0), datetime(2026, 3, 10, 10, 0)),
+        StubEvent(datetime(2026, 3, 10, 14, 0), datetime(2026, 3, 10, 15, 0)),
+    ]
+
+    windows = _build_candidate_windows(datetime(2026, 3, 10, 9, 0), datetime(2026, 3, 10, 19, 0), events)
+
+    assert windows == [
+        CandidateWindow(datetime(2026, 3, 10, 12, 0), datetime(2026, 3, 10, 14, 0)),
+        CandidateWindow(datetime(2026, 3, 10, 15, 0), datetime(2026, 3, 10, 19, 0)),
     ]
+
+
+def test_cached_windows_reuse_unchanged_schedules():
+    day_start, day_end = datetime(2026, 3, 10, 8, 0), datetime(2026, 3, 10, 19, 0)
+    starts = (datetime(2026, 3, 10, 10, 0),)
+
+    first = _cached_windows(day_start, day_end, starts, (datetime(2026, 3, 10, 11, 0),))
+    again = _cached_windows(day_start, day_end, starts, (datetime(2026, 3, 10, 11, 0),))
+    moved = _cached_windows(day_start, day_end, starts, (datetime(2026, 3, 10, 12, 0),))
+
+    assert again is first
+    assert moved[1] == CandidateWindow(datetime(2026, 3, 10, 12, 0), day_end)
+
+
+def test_neighbors_for_slot_handles_overlapping_events():
+    long_meeting = StubEvent(datetime(2026, 3, 10, 9, 0), datetime(2026, 3, 10, 13, 0))
+    short_call = StubEvent(datetime(2026, 3, 10, 9, 30), datetime(2026, 3, 10, 10, 0))
+    lunch = StubEvent(datetime(2026, 3, 10, 13, 0), datetime(2026, 3, 10, 14, 0))
+    sorted_events, starts, ends = _sorted_event_bounds([lunch, long_meeting, short_call])
+
+    assert _neighbors_for_slot(
+        sorted_events, starts, ends, datetime(2026, 3, 10, 10, 30), datetime(2026, 3, 10, 11, 0)
+    ) == (short_call, lunch)
+    assert _neighbors_for_slot(
+        sorted_events, starts, ends, datetime(2026, 3, 10, 8, 0), datetime(2026, 3, 10, 8, 30)
+    ) == (None, long_meeting)
+    assert _neighbors_for_slot(
+        sorted_events, starts, ends, datetime(2026, 3, 10, 15, 0), datetime(2026, 3, 10, 16, 0)
+    ) == (lunch, None)
+
+
+def test_event_ids_are_time_ordered_uuid7():
+    first = _uuid7()
+    time.sleep(0.002)
+    second = _uuid7()
+
+    assert uuid.UUID(first).version == 7
+    assert first < second
@@ -9,6 +9,7 @@ export type EventInput = {
 
 export type SalesEvent = EventInput & {
   id: string;
+  geocoding_status: "pending" | "done" | "failed";
 };
 
 export type RecommendationRequest = {